@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Mitgelieferte Weltdefinition, aus der das memory-Backend eine Welt bekommt,
+# wenn keine Welt-Datei da ist (data/worlds/world.json ist nicht im Repo)
+DEFINITION_FILE = Path(__file__).resolve().parents[2] / 'data' / 'definitions' / 'ragventure.json'
+
+
+def memory_world_file():
+    """
+    Welt-Datei für das memory-Backend: GAME_WORLD_FILE bzw. data/worlds/world.json,
+    sonst einmalig aus DEFINITION_FILE erzeugt (im Embedding-Cache-Verzeichnis,
+    neu erzeugt, wenn die Definition neuer ist)
+    """
+    from dotenv import load_dotenv
+    from model.memory_model import DEFAULT_WORLD_FILE
+    from utils.embedding_cache import cache_dir
+
+    load_dotenv()
+    path = Path(os.getenv('GAME_WORLD_FILE') or DEFAULT_WORLD_FILE)
+    if path.exists():
+        return path
+
+    generated = cache_dir() / f'world_{DEFINITION_FILE.stem}.json'
+    if generated.exists() and generated.stat().st_mtime >= DEFINITION_FILE.stat().st_mtime:
+        return generated
+
+    from model.world_loader import load_definition, build_nodes, validate, embed_nodes, load_file
+    from utils.embedding_utils import MODEL_NAME
+    from utils.embedding_backend import load_encoder
+
+    print(f"{path} fehlt, erzeuge Welt aus {DEFINITION_FILE.name} -> {generated}")
+    definition = load_definition(DEFINITION_FILE)
+    nodes = build_nodes(definition)
+    edges = validate(nodes, definition.get('relationships', []))
+    embed_nodes(nodes, load_encoder(MODEL_NAME))
+    generated.parent.mkdir(parents=True, exist_ok=True)
+    load_file(nodes, edges, generated)
+    return generated
+
+
+def create_bench_model(backend):
+    """wie model.factory.create_model, das memory-Backend mit memory_world_file()"""
+    if backend == 'memory':
+        from model.memory_model import MemoryGameModel
+        return MemoryGameModel(world_file=memory_world_file())
+
+    from model.factory import create_model
+    return create_model(backend)
+
+
+def measure(fn, repeat=100, warmup=5):
+    """
+    misst die Laufzeit einer Funktion
+
+    args:
+        fn (callable): Funktion ohne Argumente
+        repeat (int): Anzahl gemessener Aufrufe
+        warmup (int): Anzahl Aufrufe vor der Messung (Caches, Verbindungen)
+
+    returns:
+        list: Laufzeiten in Millisekunden
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def print_summary(name, summary):
+    print(
+        f"{name:32} n={summary['n']:<6} "
+        f"mean={summary['mean_ms']:8.3f}ms "
+        f"p50={summary['p50_ms']:8.3f}ms "
+        f"p95={summary['p95_ms']:8.3f}ms "
+        f"p99={summary['p99_ms']:8.3f}ms"
+    )
+
+
+def measure_alternating(first, second, repeat=100, warmup=5):
+    """
+    misst zwei Funktionen im Wechsel, z.B. take_item/drop_item, damit die
+    Welt nach dem Benchmark wieder im Ausgangszustand ist
+
+    returns:
+        tuple: (Laufzeiten first, Laufzeiten second) in Millisekunden
+    """
+    for _ in range(warmup):
+        first()
+        second()
+
+    timings_first, timings_second = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        first()
+        middle = time.perf_counter()
+        second()
+        end = time.perf_counter()
+        timings_first.append((middle - start) * 1000)
+        timings_second.append((end - middle) * 1000)
+
+    return timings_first, timings_second
+
+
+def peak_allocation_kb(fn, calls=10):
+    """höchster Python-Speicherbedarf (tracemalloc) während einiger Aufrufe"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        for _ in range(calls):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def cycle(values):
+    """liefert bei jedem Aufruf den nächsten Wert (endlos)"""
+    state = {'index': -1}
+
+    def next_value():
+        state['index'] = (state['index'] + 1) % len(values)
+        return values[state['index']]
+
+    return next_value
+
+
+def rss_mb():
+    """maximaler Resident Set Size des Prozesses in MB"""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: Bytes
+    return maxrss / 1024 / (1024 if sys.platform == 'darwin' else 1)
@@ -0,0 +1,128 @@
+"""
+Benchmark: Inferenz-Backends für EmbeddingUtils (torch, onnx, onnx-int8)
+
+Jedes Backend läuft in einem eigenen Prozess (sauberer RSS). Gemessen werden
+Ladezeit, encode()-Latenz pro Einzeltext, Peak-RSS und die Übereinstimmung
+mit torch bei verb_to_command (alle Template-Verben) und match_entities
+(Entity-Namen gegen alle Entities der Welt).
+
+Aufruf (aus src/):
+    python -m benchmarks.embedding_backends
+    python -m benchmarks.embedding_backends --backend torch --backend onnx-int8 --output backends.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from model.factory import BACKENDS
+from utils.command_templates import COMMAND_TEMPLATES
+from utils.embedding_backend import EMBEDDING_BACKENDS
+from utils.stats import summarize
+from benchmarks.common import measure, cycle, rss_mb
+from benchmarks.quantization import load_entities, candidates_for
+
+# Texte wie sie pro Befehl encodiert werden (Verben und Nomen)
+ENCODE_INPUTS = ['geh', 'nimm', 'fackel', 'schmeiß weg', 'den rostigen schlüssel', 'taverne']
+
+
+def run_backend(backend, world_backend, repeat, warmup):
+    """läuft im Kindprozess: lädt EmbeddingUtils mit backend und misst"""
+    os.environ['EMBEDDING_BACKEND'] = backend
+
+    from utils.embedding_utils import EmbeddingUtils
+
+    start = time.perf_counter()
+    embedding_utils = EmbeddingUtils()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    # encode direkt am Modell, am LRU-Cache von EmbeddingUtils vorbei
+    next_text = cycle(ENCODE_INPUTS)
+    timings = measure(
+        lambda: embedding_utils.model.encode(next_text(), normalize_embeddings=True, convert_to_numpy=True),
+        repeat, warmup
+    )
+
+    verbs = sorted({verb for template in COMMAND_TEMPLATES for verb in template.verbs})
+    commands = {verb: embedding_utils.verb_to_command(verb)['best_command'] for verb in verbs}
+
+    entities = load_entities(world_backend)
+    candidates = candidates_for(entities, 'float32')
+    matches = {
+        entity['name']: embedding_utils.match_entities(entity['name'], candidates, top_k=1)[0]['id']
+        for entity in entities if entity['name']
+    }
+
+    return {
+        'load_ms': load_ms,
+        'encode': summarize(timings),
+        'rss_mb': rss_mb(),
+        'commands': commands,
+        'matches': matches,
+    }
+
+
+def agreement(results, reference, key):
+    """Anteil gleicher Ergebnisse wie reference"""
+    expected = reference[key]
+    if not expected:
+        return None
+    return sum(results[key].get(name) == value for name, value in expected.items()) / len(expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', action='append', choices=EMBEDDING_BACKENDS,
+                        help='zu messende Backends (mehrfach, default: alle)')
+    parser.add_argument('--world', choices=BACKENDS, default='memory', help='Welt für match_entities')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--output', help='Ergebnisse als JSON speichern')
+    args = parser.parse_args()
+
+    backends = args.backend or list(EMBEDDING_BACKENDS)
+    if 'torch' not in backends:
+        backends.insert(0, 'torch')
+
+    results = {}
+    for backend in backends:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                results[backend] = executor.submit(
+                    run_backend, backend, args.world, args.repeat, args.warmup
+                ).result()
+            except ImportError as e:
+                print(f"{backend:10} übersprungen: {e}")
+
+    if 'torch' not in results:
+        sys.exit('torch-Referenz fehlt')
+
+    reference = results['torch']
+    report = {}
+    for backend, result in results.items():
+        report[backend] = {
+            'load_ms': result['load_ms'],
+            'encode': result['encode'],
+            'rss_mb': result['rss_mb'],
+            'verb_agreement': agreement(result, reference, 'commands'),
+            'entity_agreement': agreement(result, reference, 'matches'),
+        }
+        summary = report[backend]
+        print(
+            f"{backend:10} load={summary['load_ms']:8.0f}ms "
+            f"encode p50={summary['encode']['p50_ms']:7.2f}ms p95={summary['encode']['p95_ms']:7.2f}ms "
+            f"rss={summary['rss_mb'] or 0:7.0f}MB "
+            f"verben={summary['verb_agreement']:6.1%} entities={summary['entity_agreement'] or 0:6.1%}"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
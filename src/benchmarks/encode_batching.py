@@ -0,0 +1,105 @@
+"""
+Benchmark: Micro-Batching der encode-Aufrufe (EncodeBatcher)
+
+Simuliert --clients gleichzeitige Sessions, die jeweils --requests Texte
+encodieren. Verglichen wird einzelnes encode() pro Aufruf mit dem
+EncodeBatcher bei verschiedenen Sammelfenstern. Ausgabe: Durchsatz,
+Latenz pro Aufruf, Batchgröße und Wartezeit in der Queue.
+
+Aufruf (aus src/):
+    python -m benchmarks.encode_batching --clients 16 --window 1 --window 5 --window 10
+"""
+import json
+import time
+import argparse
+import threading
+
+from utils.embedding_utils import EmbeddingUtils
+from utils.encode_batcher import EncodeBatcher
+from utils.stats import summarize
+
+WORDS = ['geh', 'nimm', 'fackel', 'schmeiß weg', 'den rostigen schlüssel', 'taverne', 'untersuche', 'beutel']
+
+
+def run_clients(encode, clients, requests):
+    """startet clients Threads, liefert (Laufzeiten pro Aufruf in ms, Gesamtdauer in s)"""
+    timings = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+
+    def client(number):
+        barrier.wait()
+        local = []
+        for index in range(requests):
+            # eindeutige Texte, damit weder LRU noch Deduplizierung greifen
+            text = f"{WORDS[index % len(WORDS)]} {number}-{index}"
+            start = time.perf_counter()
+            encode(text)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            timings.extend(local)
+
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(clients)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+
+    return timings, time.perf_counter() - start
+
+
+def report(name, timings, duration, metrics=None):
+    summary = summarize(timings)
+    line = (
+        f"{name:14} {len(timings) / duration:8.1f} enc/s  "
+        f"p50={summary['p50_ms']:7.2f}ms p95={summary['p95_ms']:7.2f}ms"
+    )
+    if metrics:
+        line += (
+            f"  batch mean={metrics['batch_size']['mean']:5.1f} max={metrics['batch_size']['max']:3}"
+            f"  wait p95={metrics['queue_wait']['p95_ms']:6.2f}ms"
+        )
+    print(line)
+    return {'throughput': len(timings) / duration, 'latency': summary, 'batcher': metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50, help='encode-Aufrufe pro Client')
+    parser.add_argument('--window', type=float, action='append', help='Sammelfenster in ms (mehrfach)')
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--output', help='Ergebnisse als JSON speichern')
+    args = parser.parse_args()
+
+    embedding_utils = EmbeddingUtils()
+    model = embedding_utils.model
+
+    # Warmup
+    model.encode(WORDS, normalize_embeddings=True)
+
+    results = {}
+    print(f"{args.clients} Clients x {args.requests} Aufrufe\n")
+
+    timings, duration = run_clients(
+        lambda text: model.encode(text, normalize_embeddings=True, convert_to_numpy=True),
+        args.clients, args.requests
+    )
+    results['einzeln'] = report('einzeln', timings, duration)
+
+    for window_ms in args.window or [1.0, 5.0, 10.0]:
+        batcher = EncodeBatcher(embedding_utils._encode_batch, window_ms=window_ms, max_batch=args.max_batch)
+        timings, duration = run_clients(batcher.encode, args.clients, args.requests)
+        name = f'fenster {window_ms:g}ms'
+        results[name] = report(name, timings, duration, batcher.metrics())
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Benchmark: quantisierte Entity-Embeddings (float16/int8) gegen float32
+
+Recall-Check: Nomen, wie Spieler sie tippen (PLAYER_QUERIES: Kurzformen,
+Synonyme, Wortteile, die Nomen aus data/transcripts und --query), werden per
+match_entities gegen alle Locations, Items und NPCs der Welt gematcht.
+Verglichen wird der beste Treffer mit quantisierten Vektoren gegen den mit
+float32. Für knappe Fälle (Abstand Platz 1 zu Platz 2 unter --near-tie)
+wird gezeigt, wie sich der Abstand durch die Quantisierung verschiebt.
+
+Payload: Bytes pro Entity im Store, auf Bolt (PackStream) und im Python-Heap
+nach dem Empfang.
+
+Aufruf (aus src/):
+    python -m benchmarks.quantization
+    python -m benchmarks.quantization --backend neo4j --output quant.json
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from model.factory import BACKENDS
+from utils.embedding_utils import EmbeddingUtils
+from benchmarks.common import create_bench_model
+from utils.embedding_quant import (
+    EMB_FORMATS, EMB_FIELDS, scale_field, encode_embedding, decode_embedding, packstream_size
+)
+
+ENTITY_LABELS = {'Location', 'Item', 'NPC'}
+
+TRANSCRIPTS = Path(__file__).resolve().parents[2] / 'data' / 'transcripts'
+
+# Verbpartikel am Satzende ("leg den beutel ab"), kein Nomen
+SEPARABLE_PARTICLES = {'ab', 'auf', 'an', 'aus', 'mit', 'weg'}
+
+# Nomen aus echten Eingaben: nicht die exakten Entity-Namen, sondern Kurzformen,
+# Synonyme und Wortteile, bei denen zwei Entities nah beieinander liegen können
+PLAYER_QUERIES = [
+    'fackel', 'licht', 'flamme', 'feuer', 'streichholz', 'feuerzeug',
+    'kiste', 'truhe', 'schatz', 'schlüssel', 'dietrich', 'schloss',
+    'beutel', 'tasche', 'sack', 'hammer', 'werkzeug', 'schwert', 'klinge', 'waffe',
+    'buch', 'rezept', 'schrift', 'wald', 'markt', 'platz', 'schmiede', 'amboss',
+    'taverne', 'kneipe', 'wirt', 'händler', 'verkäufer',
+]
+
+# Abstand Platz 1 zu Platz 2 (float32), ab dem ein Treffer als knapp gilt
+NEAR_TIE_MARGIN = 0.05
+
+
+def load_entities(backend):
+    """Locations, Items und NPCs mit float32 Embeddings aus der Welt"""
+    model = create_bench_model(backend)
+    try:
+        world = model.export_world() if backend == 'neo4j' else model.world.to_dict()
+    finally:
+        model.close()
+
+    entities = []
+    for node in world['nodes']:
+        props = node['properties']
+        if not ENTITY_LABELS & set(node['labels']):
+            continue
+        vectors = {
+            field: decode_embedding(props.get(field), props.get(scale_field(field)))
+            for field in EMB_FIELDS if props.get(field) is not None
+        }
+        if vectors:
+            entities.append({'id': props['id'], 'name': props.get('name'), 'vectors': vectors})
+
+    return entities
+
+
+def candidates_for(entities, fmt):
+    """Kandidaten-dicts wie aus dem Model, Embeddings im Format fmt"""
+    candidates = []
+    for entity in entities:
+        # eigene emb_version pro Format, sonst liefert der Kandidaten-Cache float32
+        candidate = {'id': entity['id'], 'emb_version': fmt}
+        for field, vector in entity['vectors'].items():
+            candidate[field], candidate[scale_field(field)] = encode_embedding(vector, fmt)
+        candidates.append(candidate)
+    return candidates
+
+
+def heap_bytes(value):
+    """Python-Speicher eines empfangenen Property-Werts (Liste inkl. float-Objekte)"""
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def payload(candidates):
+    """Bytes pro Entity: Store (Rohdaten), Bolt und Python-Heap"""
+    store = bolt = heap = 0
+    for candidate in candidates:
+        for field in EMB_FIELDS:
+            value = candidate.get(field)
+            if value is None:
+                continue
+            store += len(value) if isinstance(value, bytes) else 8 * len(value)
+            bolt += packstream_size(value)
+            heap += heap_bytes(value)
+            if candidate.get(scale_field(field)) is not None:
+                store, bolt, heap = store + 8, bolt + 9, heap + 24
+
+    count = max(len(candidates), 1)
+    return {
+        'store_bytes_per_entity': store / count,
+        'bolt_bytes_per_entity': bolt / count,
+        'heap_bytes_per_entity': heap / count,
+    }
+
+
+def transcript_queries(path=TRANSCRIPTS):
+    """Nomen (letztes Wort) der Befehle aus den Transcripts, z.B. 'nimm die fackel' -> 'fackel'"""
+    nouns = set()
+    for transcript in sorted(path.glob('*.txt')):
+        for line in transcript.read_text(encoding='utf-8').splitlines():
+            command = line.split('=>')[0].strip()
+            if command and not command.startswith('#'):
+                words = [word for word in command.split() if word not in SEPARABLE_PARTICLES]
+                if len(words) > 1:
+                    nouns.add(words[-1])
+    return nouns
+
+
+def margin(result):
+    """Abstand zwischen bestem und zweitbestem Treffer"""
+    return result[0]['score'] - result[1]['score'] if len(result) > 1 else None
+
+
+def recall(embedding_utils, queries, baseline, candidates, near_ties):
+    """
+    vergleicht die Treffer mit quantisierten Kandidaten gegen float32
+
+    returns:
+        dict: recall@1 (gleicher bester Treffer), recall@2 (float32-Treffer
+        unter den besten zwei), max. Score-Abweichung und pro knapper Query
+        der Abstand Platz 1 zu Platz 2
+    """
+    same = in_top2 = 0
+    max_diff = 0.0
+    margins = {}
+    for query in queries:
+        expected = baseline[query]
+        result = embedding_utils.match_entities(query, candidates)
+        same += result[0]['id'] == expected[0]['id']
+        in_top2 += expected[0]['id'] in {match['id'] for match in result[:2]}
+        scores = {match['id']: match['score'] for match in result}
+        max_diff = max(max_diff, max(abs(scores[match['id']] - match['score']) for match in expected))
+        if query in near_ties:
+            margins[query] = {'top1': result[0]['id'], 'margin': margin(result)}
+
+    shifts = [abs(margins[query]['margin'] - margin(baseline[query])) for query in margins]
+    return {
+        'recall_at_1': same / len(queries),
+        'recall_at_2': in_top2 / len(queries),
+        'max_score_diff': max_diff,
+        'near_tie_recall_at_1': (
+            sum(margins[query]['top1'] == baseline[query][0]['id'] for query in margins) / len(margins)
+            if margins else 1.0
+        ),
+        'max_margin_shift': max(shifts, default=0.0),
+        'near_ties': margins,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='memory')
+    parser.add_argument('--query', action='append', default=[], help='zusätzlicher Suchtext (mehrfach)')
+    parser.add_argument('--near-tie', type=float, default=NEAR_TIE_MARGIN,
+                        help='Abstand Platz 1 zu 2 (float32), unter dem ein Treffer knapp ist')
+    parser.add_argument('--min-recall', type=float, default=0.99, help='Exit 1 darunter')
+    parser.add_argument('--output', help='Ergebnisse als JSON speichern')
+    args = parser.parse_args()
+
+    entities = load_entities(args.backend)
+    if not entities:
+        sys.exit('Keine Entities mit Embeddings in der Welt')
+
+    queries = sorted(set(PLAYER_QUERIES) | transcript_queries() | set(args.query))
+    embedding_utils = EmbeddingUtils()
+
+    reference = candidates_for(entities, 'float32')
+    baseline = {query: embedding_utils.match_entities(query, reference) for query in queries}
+    near_ties = {
+        query for query, result in baseline.items()
+        if margin(result) is not None and margin(result) < args.near_tie
+    }
+
+    print(f"{len(entities)} Entities, {len(queries)} Queries, {len(near_ties)} knapp (< {args.near_tie})\n")
+    results, failed = {}, False
+    for fmt in EMB_FORMATS:
+        candidates = candidates_for(entities, fmt)
+        results[fmt] = {**payload(candidates), **recall(embedding_utils, queries, baseline, candidates, near_ties)}
+        summary = results[fmt]
+        failed |= summary['recall_at_1'] < args.min_recall
+        print(
+            f"{fmt:8} recall@1={summary['recall_at_1']:6.1%} recall@2={summary['recall_at_2']:6.1%} "
+            f"knapp@1={summary['near_tie_recall_at_1']:6.1%} max_diff={summary['max_score_diff']:.4f} "
+            f"margin_shift={summary['max_margin_shift']:.4f}  "
+            f"store={summary['store_bytes_per_entity']:8.0f}B bolt={summary['bolt_bytes_per_entity']:8.0f}B "
+            f"heap={summary['heap_bytes_per_entity']:8.0f}B  (pro Entity)"
+        )
+
+    # Knappe Treffer: bester Treffer und Abstand zu Platz 2 pro Format
+    if near_ties:
+        print("\nKnappe Treffer (Abstand Platz 1 zu 2):")
+        for query in sorted(near_ties, key=lambda query: margin(baseline[query])):
+            expected = baseline[query]
+            line = f"  {query:12} {expected[0]['id']}/{expected[1]['id']}"
+            for fmt in EMB_FORMATS:
+                tie = results[fmt]['near_ties'][query]
+                flipped = '' if tie['top1'] == expected[0]['id'] else f" -> {tie['top1']}"
+                line += f"  {fmt}={tie['margin']:+.4f}{flipped}"
+            print(line)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'backend': args.backend,
+                'entities': len(entities),
+                'queries': queries,
+                'results': results,
+            }, f, indent=2)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
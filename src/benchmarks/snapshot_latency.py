@@ -0,0 +1,54 @@
+"""
+Benchmark: Laden des Spielzustands pro Zug
+
+Vergleicht die vier Einzel-Queries (alter _update_game_state) mit
+GameModel.snapshot() gegen eine lokale Neo4j-Instanz (.env).
+
+Aufruf (aus src/):
+    python -m benchmarks.snapshot_latency --repeat 200
+"""
+import argparse
+
+from model.game_model import GameModel
+from utils.stats import summarize
+from benchmarks.common import measure, print_summary
+
+
+def four_queries(model):
+    return {
+        'location': model.current_location(),
+        'items': model.location_content(),
+        'exits': model.location_exits(),
+        'inventory': model.player_inventory()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    args = parser.parse_args()
+
+    model = GameModel()
+    try:
+        # Beide Varianten müssen den gleichen Zustand liefern
+        before = four_queries(model)
+        after = model.snapshot()
+        for key in before:
+            ids_before = sorted(x['id'] for x in before[key])
+            ids_after = sorted(x['id'] for x in after[key])
+            assert ids_before == ids_after, f"{key}: {ids_before} != {ids_after}"
+
+        results = {
+            'vorher (4 Queries)': measure(lambda: four_queries(model), args.repeat, args.warmup),
+            'nachher (snapshot)': measure(model.snapshot, args.repeat, args.warmup),
+        }
+    finally:
+        model.close()
+
+    for name, timings in results.items():
+        print_summary(name, summarize(timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Micro-Benchmark-Suite für den Hot Path: Parser, Embedding-Matcher und
+GameModel-Queries/-Mutationen. Standard ist das In-Memory Backend als
+lokaler Stand-in (--backend neo4j für die Instanz aus .env).
+
+Schreibt die Ergebnisse als JSON (p50/p95/p99, Peak-Allokation, RSS), damit
+sich Commits vergleichen lassen. Mutationen laufen paarweise (hin/zurück,
+nehmen/ablegen), die Welt ist danach wieder im Ausgangszustand.
+
+Aufruf (aus src/):
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --output neu.json --compare bench.json
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+from model.factory import BACKENDS
+from utils.smart_parser import SmartParser
+from utils.embedding_utils import EmbeddingUtils
+from utils.stats import summarize
+from benchmarks.common import measure, measure_alternating, peak_allocation_kb, cycle, rss_mb, create_bench_model
+
+# Müssen vom Fast-Path erkannt werden (Start: Marktplatz, siehe data/definitions/ragventure.json)
+RULE_INPUTS = ['nimm beutel', 'geh zur taverne', 'leg den beutel ab', 'geh']
+DEPENDENCY_INPUTS = ['ich möchte gern zur Taverne laufen', 'schnapp dir den goldenen Esel', 'wirf die Fackel weg']
+VERBS = ['geh', 'nimm', 'lauf', 'schnapp', 'wirf weg', 'untersuche', 'lies', 'rede']
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parser_benches(smart_parser, entity_names):
+    # sonst misst parse[rule] in Wahrheit spaCy
+    for text in RULE_INPUTS:
+        if smart_parser.rule_parser.parse(text, entity_names) is None:
+            print(f"  Warnung: '{text}' geht nicht über den Fast-Path (Entities: {entity_names})")
+
+    next_rule = cycle(RULE_INPUTS)
+    next_dependency = cycle(DEPENDENCY_INPUTS)
+    return {
+        'parser.parse[rule]': lambda: smart_parser.parse(next_rule(), entity_names),
+        'parser.parse[dependency]': lambda: smart_parser.parse(next_dependency(), entity_names),
+    }
+
+
+def embedding_benches(embedding_utils, state):
+    next_verb = cycle(VERBS)
+    candidates = state['items'] + state['exits']
+    return {
+        'embedding.verb_to_command': lambda: embedding_utils.verb_to_command(next_verb()),
+        'embedding.match_entities': lambda: embedding_utils.match_entities('Fackel', candidates),
+    }
+
+
+def model_benches(model):
+    return {
+        'model.current_location': model.current_location,
+        'model.location_content': model.location_content,
+        'model.location_exits': model.location_exits,
+        'model.player_inventory': model.player_inventory,
+        'model.snapshot': model.snapshot,
+    }
+
+
+def run_benches(benches, repeat, warmup):
+    results = {}
+    for name, fn in benches.items():
+        timings = measure(fn, repeat, warmup)
+        results[name] = summarize(timings)
+        results[name]['peak_alloc_kb'] = peak_allocation_kb(fn)
+        print(f"  {name:32} p50={results[name]['p50_ms']:8.3f}ms p95={results[name]['p95_ms']:8.3f}ms")
+    return results
+
+
+def _checked(name, result):
+    """Mutationen liefern [] wenn nichts passiert ist, dann wäre die Messung wertlos"""
+    if not result:
+        sys.exit(f"{name} hat nichts verändert, Messung abgebrochen")
+    return result
+
+
+def takeable_item(model, state):
+    """
+    erster Eintrag im Raum, der sich nehmen lässt (items enthält auch NPCs),
+    wird einmal genommen und wieder abgelegt
+    """
+    for row in state['items']:
+        if model.take_item(row['id']):
+            _checked(f"drop_item({row['id']!r})", model.drop_item(row['id']))
+            return row['id']
+    return None
+
+
+def run_mutations(model, state, repeat, warmup):
+    """move_player, take_item und drop_item paarweise messen"""
+    results = {}
+    origin = state['location'][0]['id']
+
+    if state['exits']:
+        target = state['exits'][0]['id']
+        _checked(f"move_player({target!r})", model.move_player(target))
+        _checked(f"move_player({origin!r})", model.move_player(origin))
+        there, back = measure_alternating(
+            lambda: model.move_player(target),
+            lambda: model.move_player(origin),
+            repeat, warmup
+        )
+        results['model.move_player'] = summarize(there + back)
+
+    item = takeable_item(model, state)
+    if item is None:
+        print(f"  Kein Item zum Nehmen in {origin}, take_item/drop_item übersprungen")
+    else:
+        taken, dropped = measure_alternating(
+            lambda: model.take_item(item),
+            lambda: model.drop_item(item),
+            repeat, warmup
+        )
+        results['model.take_item'] = summarize(taken)
+        results['model.drop_item'] = summarize(dropped)
+
+    for name, summary in results.items():
+        print(f"  {name:32} p50={summary['p50_ms']:8.3f}ms p95={summary['p95_ms']:8.3f}ms")
+
+    return results
+
+
+def compare(current, baseline_path, tolerance):
+    """vergleicht p50/p95 mit einem älteren Lauf, liefert Anzahl Regressionen"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    print(f"\nVergleich mit {baseline_path} ({baseline['meta'].get('commit')}):")
+    for name, summary in current['results'].items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if old[key] <= 0:
+                continue
+            change = (summary[key] - old[key]) / old[key]
+            flag = ''
+            if change > tolerance:
+                flag = '  <-- Regression'
+                regressions += 1
+            print(f"  {name:32} {key} {old[key]:8.3f} -> {summary[key]:8.3f}ms ({change:+.0%}){flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='memory')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--output', help='Ergebnisse als JSON speichern')
+    parser.add_argument('--compare', help='älteres Ergebnis-JSON zum Vergleich')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='erlaubte Verschlechterung (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    model = create_bench_model(args.backend)
+    try:
+        smart_parser = SmartParser()
+        embedding_utils = EmbeddingUtils()
+
+        state = model.snapshot()
+        entity_names = [x['name'] for key in ('items', 'exits', 'inventory') for x in state[key]]
+
+        results = {}
+        print('Parser')
+        results.update(run_benches(parser_benches(smart_parser, entity_names), args.repeat, args.warmup))
+        print('Embedding')
+        results.update(run_benches(embedding_benches(embedding_utils, state), args.repeat, args.warmup))
+        print('Model')
+        results.update(run_benches(model_benches(model), args.repeat, args.warmup))
+        results.update(run_mutations(model, state, args.repeat, args.warmup))
+
+        # nur neo4j: Transaktionen, Retries und Pool-Waits, Prefetch-Treffer
+        pool_stats = getattr(model, 'pool_stats', None)
+        prefetcher = getattr(model, 'prefetcher', None)
+    finally:
+        model.close()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': args.backend,
+            'repeat': args.repeat,
+            'rss_mb': rss_mb(),
+            'pool': pool_stats.summary() if pool_stats else None,
+            'prefetch': prefetcher.metrics() if prefetcher else None,
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare and compare(report, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+
+from controller.game_controller import GameController
+from utils.log_setup import SAMPLED, state_summary
+from utils.tracing import span
+from model.async_game_model import AsyncGameModel
+
+
+class AsyncGameController(GameController):
+    """
+    Controller für das AsyncGameModel.
+
+    Parser und Embeddings (CPU-Arbeit) laufen in einem Worker-Thread,
+    die DB-Zugriffe werden im Event-Loop awaited.
+    """
+
+    def __init__(self, view=None, model_factory=AsyncGameModel, shared=None):
+        super().__init__(view=view, model_factory=model_factory, shared=shared)
+
+    async def update_game_state(self):
+
+        # Location, Items, Exits und Inventar gleichzeitig laden
+        with span('state'):
+            self.game_state = await self.model.snapshot()
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("State: %s", state_summary(self.game_state), extra={**SAMPLED, 'event': 'state'})
+        self.view.update_panels(**self.game_state)
+
+    async def process_input_async(self, input):
+
+        action = await asyncio.to_thread(self.plan_action, input)
+
+        # Antwort ohne DB-Zugriff (quit, Rückfrage, nicht verstanden)
+        if isinstance(action, str):
+            return action
+
+        with span('mutate', mutation=action.mutation):
+            result = await getattr(self.model, action.mutation)(action.target)
+        return action.describe(result)
+
+    async def run_game_async(self):
+        self.game_running = True
+
+        self.view.show_welcome(readiness=self.readiness())
+        await asyncio.to_thread(input)
+        await self.model.start()
+        await self.update_game_state()
+
+        self.view.refresh()
+
+        while self.game_running:
+            user_input = await asyncio.to_thread(self.view.get_input)
+            with span('turn'):
+                status = await self.process_input_async(user_input)
+                await self.update_game_state()
+                with span('render'):
+                    self.view.refresh(status=status)
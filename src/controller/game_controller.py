@@ -1,45 +1,119 @@
 
 import logging
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
 from view.game_view import GameView
-from model.game_model import GameModel
+from model.factory import create_model
 from utils.smart_parser import SmartParser
 from utils.embedding_utils import EmbeddingUtils
+from utils.log_setup import SAMPLED, configure_logging, state_summary
+from utils.tracing import configure_tracing, span
+
+# Komponenten, die beim Start im Hintergrund geladen werden
+COMPONENTS = {
+    'model': ('Spielwelt', create_model),
+    'parser': ('spaCy', SmartParser),
+    'embedding_utils': ('SentenceTransformer', EmbeddingUtils),
+}
+
+
+@dataclass
+class Action:
+    """geplante Änderung der Welt, z.B. move_player('taverne')"""
+    mutation: str   # Methode des Models
+    target: str     # id der Entity
+    success: str    # Antwort bei Erfolg, {name} aus dem Query-Ergebnis
+    failure: str    # Antwort, wenn die Query nichts geändert hat
+
+    def describe(self, result):
+        if result:
+            return self.success.format(name=result[0]['name'])
+        return self.failure
+
 
 class GameController:
 
-    def __init__(self):
-        
-        self.view = GameView()
-        self.model = GameModel()
-        self.parser = SmartParser()
+    def __init__(self, view=None, model_factory=None, shared=None):
         
-        self.embedding_utils = EmbeddingUtils()
+        # view: z.B. NullView für Headless-Betrieb (Replay)
+        self.view = view or GameView()
+
+        components = dict(COMPONENTS)
+        if model_factory is not None:
+            components['model'] = (COMPONENTS['model'][0], model_factory)
+
+        # shared: bereits geladene Komponenten (Server: ein Parser für alle Sessions)
+        self._loading = {}
+        for name, component in (shared or {}).items():
+            self._loading[name] = Future()
+            self._loading[name].set_result(component)
+            components.pop(name)
+
+        # Parser, Embeddings und DB parallel laden, damit der Welcome-Screen
+        # sofort erscheint. Gewartet wird erst, wenn eine Komponente gebraucht wird.
+        executor = ThreadPoolExecutor(max_workers=len(COMPONENTS), thread_name_prefix='warmup')
+        for name, (label, factory) in components.items():
+            future = executor.submit(factory)
+            future.add_done_callback(
+                lambda f, label=label: self.view.show_ready(label, f.exception())
+            )
+            self._loading[name] = future
+        executor.shutdown(wait=False)
         
         self.game_state = {}
         self.game_running = False
 
-        logging.basicConfig(
-            filename='parser_debug.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(message)s'
-        )
+        configure_logging()
+        configure_tracing()
+
+    def _component(self, name):
+        """liefert eine Komponente, wartet (mit Anzeige) falls sie noch lädt"""
+        future = self._loading[name]
+
+        if not future.done():
+            with self.view.loading(COMPONENTS[name][0]):
+                return future.result()
+
+        return future.result()
+
+    @property
+    def model(self):
+        return self._component('model')
+
+    @property
+    def parser(self):
+        return self._component('parser')
+
+    @property
+    def embedding_utils(self):
+        return self._component('embedding_utils')
+
+    def readiness(self):
+        """dict: Anzeigename -> fertig geladen?"""
+        return {label: self._loading[name].done() for name, (label, _) in COMPONENTS.items()}
 
     def _update_game_state(self):
 
-        self.game_state = {
-            'location': self.model.current_location(),
-            'items': self.model.location_content(),
-            'exits': self.model.location_exits(),
-            'inventory': self.model.player_inventory()
-        }
+        # Location, Items, Exits und Inventar in einem Round Trip
+        with span('state'):
+            self.game_state = self.model.snapshot()
         
-        logging.info(f"State: {self.game_state}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("State: %s", state_summary(self.game_state), extra={**SAMPLED, 'event': 'state'})
         self.view.update_panels(**self.game_state)
 
+    def _entity_names(self):
+        """Namen aller sichtbaren Entities für den Fast-Path des Parsers"""
+        return [
+            entity['name']
+            for key in ('items', 'exits', 'inventory')
+            for entity in self.game_state.get(key, [])
+        ]
+
     def run_game(self):
         self.game_running = True
 
-        self.view.show_welcome()
+        self.view.show_welcome(readiness=self.readiness())
         input()
         self._update_game_state()
 
@@ -47,17 +121,39 @@ class GameController:
 
         while self.game_running:
             user_input = self.view.get_input()
-            status = self.process_input(user_input)
-            self._update_game_state()
-            self.view.refresh(status=status)
+            with span('turn'):
+                status = self.process_input(user_input)
+                self._update_game_state()
+                with span('render'):
+                    self.view.refresh(status=status)
     
     def process_input(self, input):
 
+        action = self.plan_action(input)
+
+        # Antwort ohne DB-Zugriff (quit, Rückfrage, nicht verstanden)
+        if isinstance(action, str):
+            return action
+
+        with span('mutate', mutation=action.mutation):
+            result = getattr(self.model, action.mutation)(action.target)
+        return action.describe(result)
+
+    def plan_action(self, input):
+        """
+        versteht die Eingabe (Parser + Embeddings), ohne die Welt zu verändern
+
+        returns:
+            str: direkte Antwort, oder
+            Action: auszuführende Model-Mutation
+        """
+
         if input == 'quit':
             self.game_running = False
+            logging.info("Parser Fast-Path Trefferquote: %.0f%% %s", self.parser.hit_rate() * 100, self.parser.tier_counts())
             return "Auf Wiedersehen!"
 
-        parsed = self.parser.parse(input)
+        parsed = self.parser.parse(input, entity_names=self._entity_names())
 
         verb = parsed[0]['verb']
         noun = parsed[0]['noun']
@@ -74,12 +170,14 @@ class GameController:
                     noun, 
                     [x for x in self.game_state['exits']]
                 )
-                result = self.model.move_player(exit[0]['id'])
-
-                if result:
-                    return f'Du bist jetzt in {result[0]['name']}'
-                else:
-                    return 'Ups, gestolpert?'
+                # Keine Ausgänge: match_entities liefert []
+                if not exit:
+                    return "Von hier führt kein Weg weg."
+                return Action(
+                    'move_player', exit[0]['id'],
+                    success='Du bist jetzt in {name}',
+                    failure='Ups, gestolpert?'
+                )
 
         elif command['best_command'] == 'take':
             if not noun:
@@ -89,13 +187,13 @@ class GameController:
                     noun, 
                     [x for x in self.game_state['items']]
                 )
-                result = self.model.take_item(item[0]['id'])
-
-                
-                if result:
-                    return f'Du trägst jetzt {result[0]['name']}'
-                else:
-                    return 'Ups, fallengelassen?'
+                if not item:
+                    return "Das siehst du hier nicht."
+                return Action(
+                    'take_item', item[0]['id'],
+                    success='Du trägst jetzt {name}',
+                    failure='Ups, fallengelassen?'
+                )
 
         elif command['best_command'] == 'drop':
             if not noun:
@@ -105,12 +203,13 @@ class GameController:
                     noun,
                     [x for x in self.game_state['inventory']]
                 )
-                result = self.model.drop_item(item[0]['id'])
-                
-                if result:
-                    return f'Du hast {result[0]['name']} abgelegt.'
-                else:
-                    return 'Ups, nicht da?'
+                if not item:
+                    return "Das hast du nicht dabei."
+                return Action(
+                    'drop_item', item[0]['id'],
+                    success='Du hast {name} abgelegt.',
+                    failure='Ups, nicht da?'
+                )
 
         else:
-            return f"Das konnte nicht entschlüsselt werden."
\ No newline at end of file
+            return f"Das konnte nicht entschlüsselt werden."
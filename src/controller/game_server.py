@@ -0,0 +1,132 @@
+import os
+import re
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from view.text_view import TextView
+from model.factory import create_model
+from controller.game_controller import GameController
+from utils.smart_parser import SmartParser
+from utils.embedding_utils import EmbeddingUtils
+from utils.tracing import span
+
+# Zeichen, die in einer Player-id erlaubt sind
+PLAYER_NAME_PATTERN = re.compile(r'[^a-z0-9_]')
+
+
+def player_id_for(name):
+    """Player-id aus dem Namen, mit Präfix damit sie keiner Item-/Location-id gleicht"""
+    name = PLAYER_NAME_PATTERN.sub('', name.strip().lower())[:32]
+    return f'player_{name}' if name else None
+
+
+class GameServer:
+    """
+    Textserver für mehrere Spieler (TCP, eine Zeile pro Befehl).
+
+    Parser, Embeddings und Model-Verbindung (Driver bzw. Welt) werden einmal
+    geladen und von allen Sessions geteilt. Jede Session hat einen eigenen
+    GameController mit eigenem Player-Node (model.with_player). Parser und
+    DB-Zugriffe laufen in einem gemeinsamen Thread-Pool, der Event-Loop
+    kümmert sich nur um die Verbindungen.
+    """
+
+    def __init__(self, workers=8):
+        # Der Cache eines Spielers merkt nichts von den Zügen der anderen,
+        # ohne Cache gibt es auch keinen Prefetch-Thread
+        if os.getenv('GAME_STATE_CACHE', '0') == '1':
+            logging.warning("GAME_STATE_CACHE ist im Server-Betrieb deaktiviert")
+
+        # Alles Teure parallel laden, wie beim GameController
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix='warmup') as executor:
+            model = executor.submit(create_model, cache=False)
+            parser = executor.submit(SmartParser)
+            embedding_utils = executor.submit(EmbeddingUtils)
+
+        self.model = model.result()
+        self.shared = {'parser': parser.result(), 'embedding_utils': embedding_utils.result()}
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='session')
+        self.players = set()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+        pool_stats = getattr(self.model, 'pool_stats', None)
+        if pool_stats is not None:
+            logging.info("Neo4j-Pool: %s", pool_stats.summary())
+        self.model.close()
+
+        batcher = self.shared['embedding_utils'].batcher
+        if batcher is not None:
+            logging.info("Encode-Batching: %s", batcher.metrics())
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    @staticmethod
+    def _turn(controller, command=None):
+        """ein Zug im Worker-Thread: Befehl ausführen, Zustand laden, Text rendern"""
+        with span('turn'):
+            status = controller.process_input(command) if command is not None else ''
+            controller._update_game_state()
+            with span('render'):
+                controller.view.refresh(status=status)
+            return controller.view.take_output()
+
+    async def handle(self, reader, writer):
+        """eine Verbindung = eine Session"""
+        peer = writer.get_extra_info('peername')
+
+        writer.write('Wie heißt du? '.encode('utf-8'))
+        await writer.drain()
+        player_id = player_id_for((await reader.readline()).decode('utf-8', errors='replace'))
+
+        if player_id is None or player_id in self.players:
+            writer.write('Name ungültig oder schon im Spiel.\n'.encode('utf-8'))
+            await writer.drain()
+            writer.close()
+            return
+
+        self.players.add(player_id)
+        logging.info("Session %s: %s (%d Spieler)", peer, player_id, len(self.players))
+
+        model = self.model.with_player(player_id)
+        controller = GameController(view=TextView(), model_factory=lambda: model, shared=self.shared)
+        controller.game_running = True
+
+        try:
+            await self._run(model.ensure_player)
+            controller.view.show_welcome()
+            output = await self._run(self._turn, controller)
+
+            while controller.game_running:
+                writer.write(f"{output}\n? ".encode('utf-8'))
+                await writer.drain()
+
+                line = await reader.readline()
+                if not line:
+                    return
+
+                command = line.decode('utf-8', errors='replace').strip()
+                if command:
+                    output = await self._run(self._turn, controller, command)
+
+            writer.write(f"{output}\n".encode('utf-8'))
+            await writer.drain()
+
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logging.info("Session %s abgebrochen: %s", peer, e)
+        except Exception:
+            logging.exception("Fehler in Session %s (%s)", peer, player_id)
+        finally:
+            self.players.discard(player_id)
+            model.close()
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        logging.info("Server läuft auf %s:%s", host, port)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,92 @@
+import time
+
+from utils.stats import summarize
+from utils.tracing import span, tracer
+
+# Trenner zwischen Befehl und erwarteter Statusmeldung im Transcript
+EXPECT_SEPARATOR = '=>'
+
+
+def load_transcript(path):
+    """
+    liest ein Transcript: ein Befehl pro Zeile, optional mit erwarteter
+    Antwort ("nimm fackel => Du trägst jetzt Flackernde Fackel").
+    Leerzeilen und Zeilen mit # werden ignoriert.
+
+    returns:
+        list: [(befehl, erwartet oder None)]
+    """
+    steps = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            command, _, expected = line.partition(EXPECT_SEPARATOR)
+            steps.append((command.strip(), expected.strip() or None))
+
+    return steps
+
+
+def _public_state(game_state):
+    """Spielzustand ohne Embeddings (nur ids und Namen)"""
+    return {
+        key: [{'id': entity.get('id'), 'name': entity.get('name')} for entity in entities]
+        for key, entities in game_state.items()
+    }
+
+
+def replay(controller, steps):
+    """
+    spielt Befehle ohne Terminal durch process_input und _update_game_state
+
+    Achtung: Die Befehle verändern die Welt in der Datenbank.
+
+    args:
+        controller (GameController): idealerweise mit NullView
+        steps (list): [(befehl, erwartet oder None)], siehe load_transcript
+
+    returns:
+        dict: turns (Zeiten pro Befehl), summary, failures, final_state
+              und stages (Zeiten pro Stufe, nur mit aktivem Tracing)
+    """
+    controller.game_running = True
+    controller._update_game_state()
+
+    turns = []
+    for command, expected in steps:
+
+        with span('turn', command=command):
+            start = time.perf_counter()
+            status = controller.process_input(command)
+            processed = time.perf_counter()
+            controller._update_game_state()
+            done = time.perf_counter()
+
+        turns.append({
+            'command': command,
+            'status': status,
+            'expected': expected,
+            'ok': expected is None or status == expected,
+            'process_ms': (processed - start) * 1000,
+            'state_ms': (done - processed) * 1000,
+            'total_ms': (done - start) * 1000
+        })
+
+        if not controller.game_running:
+            break
+
+    active = tracer()
+
+    return {
+        'turns': turns,
+        'summary': {
+            'process': summarize([turn['process_ms'] for turn in turns]),
+            'state': summarize([turn['state_ms'] for turn in turns]),
+            'total': summarize([turn['total_ms'] for turn in turns])
+        },
+        'failures': [turn for turn in turns if not turn['ok']],
+        'final_state': _public_state(controller.game_state),
+        'stages': active.summary() if active is not None else None
+    }
@@ -1,3 +1,6 @@
+import os
+import asyncio
+from dotenv import load_dotenv
 from controller.game_controller import GameController
 
 def main():
@@ -5,7 +8,23 @@ def main():
     try:
         controller.run_game()
     finally:
+        controller.view.close()
         controller.model.close()
 
+async def main_async():
+    # Import erst hier: braucht den neo4j AsyncDriver
+    from controller.async_game_controller import AsyncGameController
+
+    controller = AsyncGameController()
+    try:
+        await controller.run_game_async()
+    finally:
+        controller.view.close()
+        await controller.model.close()
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    load_dotenv()
+    if os.getenv('GAME_ASYNC', '0') == '1':
+        asyncio.run(main_async())
+    else:
+        main()
@@ -0,0 +1,183 @@
+import os
+import time
+import asyncio
+import logging
+import itertools
+from dotenv import load_dotenv
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import Neo4jError
+from model import queries, schema
+from model.connection import PoolStats, driver_config, session_config
+from model.embedding_store import EmbeddingStore
+from utils.tracing import span
+
+
+class AsyncGameModel:
+    """
+    Async-Variante von GameModel auf dem neo4j AsyncDriver.
+
+    Gleiche Methoden und Rückgabeformate wie GameModel, aber als Coroutines.
+    snapshot() stellt die unabhängigen Lese-Queries gleichzeitig, ein Zug
+    dauert damit ungefähr so lange wie die langsamste Query. Dafür braucht
+    jede Query eine eigene (kurzlebige) Session, die Verbindungen kommen
+    aus dem Pool des Drivers.
+    """
+
+    def __init__(self, player_id=queries.PLAYER_ID, driver=None, embeddings=None, pool_stats=None,
+                 start_lock=None):
+        # .env laden
+        load_dotenv()
+
+        self.player_id = player_id
+        self._owns_driver = driver is None
+
+        # start() läuft einmal pro Driver, alle Models eines Drivers teilen den Lock
+        self._start_lock = start_lock or asyncio.Lock()
+
+        if driver is not None:
+            self.driver = driver
+            self.embeddings = embeddings
+            self.pool_stats = pool_stats
+            return
+
+        # Async DB driver erstellen, Pool-Größe & Timeouts aus .env
+        self.driver = AsyncGraphDatabase.driver(
+            uri=os.getenv('NEO4J_URI'),
+            auth=(
+                os.getenv('NEO4J_USER'),
+                os.getenv('NEO4J_PASSWORD')
+            ),
+            **driver_config()
+        )
+        self.pool_stats = PoolStats()
+
+        # Embeddings lokal statt pro Zug über Bolt, die Welt-Generation prüft
+        # start() (__init__ kann nicht awaiten)
+        self.embeddings = EmbeddingStore.for_uri(os.getenv('NEO4J_URI'))
+
+    async def close(self):
+        if not self._owns_driver:
+            return
+        self.embeddings.flush()
+        await self.driver.close()
+
+    def with_player(self, player_id):
+        """AsyncGameModel für einen weiteren Spieler auf dem gleichen Driver"""
+        return AsyncGameModel(
+            player_id=player_id,
+            driver=self.driver,
+            embeddings=self.embeddings,
+            pool_stats=self.pool_stats,
+            start_lock=self._start_lock
+        )
+
+    async def start(self):
+        """
+        einmalig vor dem ersten Zug: Constraints anlegen (wie GameModel) und
+        den Embedding-Store an die Welt-Generation binden. Gleichzeitige
+        Aufrufe warten aufeinander, damit nur ein WORLD_GENERATION-MERGE läuft.
+        """
+        async with self._start_lock:
+            if self.embeddings.generation is not None:
+                return
+
+            # id-Constraints vor dem ersten MERGE, sonst können parallele MERGEs doppelte Nodes anlegen
+            if os.getenv('GAME_SCHEMA_BOOTSTRAP', '1') == '1':
+                try:
+                    await schema.bootstrap_async(self.driver)
+                except Neo4jError as e:
+                    logging.warning(f"Schema-Bootstrap fehlgeschlagen: {e}")
+
+            result = await self._run_query(queries.WORLD_GENERATION, write=True)
+            self.embeddings.use_generation(result[0]['generation'])
+
+    async def ensure_player(self, start=None):
+        """legt den Player-Node an und stellt ihn auf die Start-Location"""
+        start = start or os.getenv('GAME_START_LOCATION') or queries.START_LOCATION
+        return await self._run_query(queries.ENSURE_PLAYER, {'start': start}, write=True)
+
+    async def _run_query(self, query, params=None, write=False):
+        """
+        führt eine Query als verwaltete Transaktion in einer eigenen Session aus
+
+        args:
+            query (str): cypher query
+            params (dict): queryparameter ($player_id wird ergänzt)
+            write (bool): execute_write statt execute_read
+
+        returns:
+            list: liste von dicts mit den ergebnissen
+        """
+        params = {'player_id': self.player_id, **(params or {})}
+        requested = time.perf_counter()
+        attempts = itertools.count()
+
+        async def work(tx):
+            self.pool_stats.started(requested, next(attempts))
+            result = await tx.run(query, params)
+            return [record.data() async for record in result]
+
+        with span('db.' + schema.query_name(query), write=write):
+            async with self.driver.session(**session_config()) as session:
+                if write:
+                    return await session.execute_write(work)
+                return await session.execute_read(work)
+
+    async def _with_embeddings(self, rows):
+        """ergänzt Query-Ergebnisse um die Embeddings aus dem lokalen Store"""
+        if self.embeddings.generation is None:
+            await self.start()
+
+        missing = self.embeddings.missing(rows)
+        if missing:
+            self.embeddings.ingest(await self._run_query(queries.EMBEDDINGS, {'ids': missing}))
+        return self.embeddings.attach(rows)
+
+    async def current_location(self):
+        return await self._with_embeddings(await self._run_query(queries.CURRENT_LOCATION))
+
+    async def location_content(self):
+        return await self._with_embeddings(await self._run_query(queries.LOCATION_CONTENT))
+
+    async def location_exits(self):
+        return await self._with_embeddings(await self._run_query(queries.LOCATION_EXITS))
+
+    async def player_inventory(self):
+        return await self._with_embeddings(await self._run_query(queries.PLAYER_INVENTORY))
+
+    async def snapshot(self):
+        """
+        liefert Location, Items, Exits und Inventar, die vier Queries
+        laufen gleichzeitig (je eine Session)
+
+        returns:
+            dict: location, items, exits, inventory
+        """
+        location, items, exits, inventory = await asyncio.gather(
+            self.current_location(),
+            self.location_content(),
+            self.location_exits(),
+            self.player_inventory()
+        )
+
+        return {
+            'location': location,
+            'items': items,
+            'exits': exits,
+            'inventory': inventory
+        }
+
+    async def move_player(self, to_location):
+        params = {'to_location': to_location}
+        return await self._run_query(queries.MOVE_PLAYER, params=params, write=True)
+
+    async def take_item(self, item):
+        params = {'item': item}
+        return await self._run_query(queries.TAKE_ITEM, params=params, write=True)
+
+    async def drop_item(self, item):
+        params = {'item': item}
+        return await self._run_query(queries.DROP_ITEM, params=params, write=True)
+
+    async def use_item(self, item, target):
+        pass
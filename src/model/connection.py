@@ -0,0 +1,100 @@
+"""
+Neo4j-Verbindung: Driver-Konfiguration aus .env und Pool-Statistik.
+
+Gemeinsam genutzt von GameModel und AsyncGameModel.
+"""
+import os
+import time
+import threading
+from collections import deque
+
+from utils.stats import summarize
+
+# Anzahl Transaktionen, über die die Wartezeiten gebildet werden
+STATS_WINDOW = 4096
+
+# Ab dieser Wartezeit (ms) bis zum Start der Transaktion zählt sie als Pool-Wait
+DEFAULT_POOL_WAIT_MS = 5.0
+
+
+def _env_number(name, cast):
+    value = os.getenv(name)
+    return cast(value) if value else None
+
+
+def driver_config():
+    """
+    Driver-Optionen aus .env (nur gesetzte Werte, sonst Default des Drivers)
+
+    NEO4J_MAX_POOL_SIZE             max. Verbindungen im Pool (Driver: 100)
+    NEO4J_ACQUISITION_TIMEOUT       Sekunden Warten auf eine freie Verbindung (Driver: 60)
+    NEO4J_MAX_TRANSACTION_RETRY_TIME Sekunden Retry bei transienten Fehlern (Driver: 30)
+    """
+    config = {
+        'max_connection_pool_size': _env_number('NEO4J_MAX_POOL_SIZE', int),
+        'connection_acquisition_timeout': _env_number('NEO4J_ACQUISITION_TIMEOUT', float),
+        'max_transaction_retry_time': _env_number('NEO4J_MAX_TRANSACTION_RETRY_TIME', float),
+    }
+    return {key: value for key, value in config.items() if value is not None}
+
+
+def session_config():
+    """
+    Session-Optionen aus .env
+
+    NEO4J_DATABASE    Datenbankname (spart die Auflösung der Home-DB)
+    NEO4J_FETCH_SIZE  Records pro Batch beim Abholen (Driver: 1000)
+    """
+    config = {
+        'database': os.getenv('NEO4J_DATABASE') or None,
+        'fetch_size': _env_number('NEO4J_FETCH_SIZE', int),
+    }
+    return {key: value for key, value in config.items() if value is not None}
+
+
+class PoolStats:
+    """
+    Zählt Transaktionen, Retries und Pool-Waits eines Drivers.
+
+    Der Driver hat keine Pool-Metriken, gemessen wird deshalb die Zeit vom
+    Aufruf bis zum Start der Transaktionsfunktion (Verbindung aus dem Pool
+    holen + BEGIN). Liegt sie über wait_ms, zählt sie als Pool-Wait.
+    """
+
+    def __init__(self, wait_ms=None):
+        self.wait_ms = wait_ms if wait_ms is not None else (
+            _env_number('NEO4J_POOL_WAIT_MS', float) or DEFAULT_POOL_WAIT_MS
+        )
+        self.transactions = 0
+        self.retries = 0
+        self.waits = 0
+        self._acquire_ms = deque(maxlen=STATS_WINDOW)
+        self._lock = threading.Lock()
+
+    def started(self, requested, attempt):
+        """
+        aus der Transaktionsfunktion aufrufen
+
+        args:
+            requested (float): time.perf_counter() vor execute_read/execute_write
+            attempt (int): 0 beim ersten Versuch, >0 bei Retries
+        """
+        with self._lock:
+            if attempt:
+                self.retries += 1
+                return
+
+            acquire_ms = (time.perf_counter() - requested) * 1000
+            self.transactions += 1
+            self._acquire_ms.append(acquire_ms)
+            if acquire_ms > self.wait_ms:
+                self.waits += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                'transactions': self.transactions,
+                'retries': self.retries,
+                'pool_waits': self.waits,
+                'acquire': summarize(list(self._acquire_ms)),
+            }
@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+from utils.embedding_cache import cache_dir
+from utils.embedding_quant import EMB_FIELDS, scale_field, decode_embedding
+
+
+class EmbeddingStore:
+    """
+    Lokaler Speicher für Entity-Embeddings, Schlüssel ist die Node-id.
+
+    Die Vektoren ändern sich praktisch nie, deshalb liefern die Queries pro
+    Zug nur ids, Namen, Beschreibungen und eine emb_version. Fehlende oder
+    veraltete ids werden einmal gesammelt nachgeladen (ingest), alles
+    andere kommt aus einer memory-mapped .npy Datei.
+
+    Dateien: <name>.npy (float32, eine Zeile pro Vektor) und <name>.json
+    (Welt-Generation + id -> version + Zeile pro Feld). Quantisierte Vektoren
+    aus der DB (float16/int8, siehe utils.embedding_quant) werden beim ingest
+    dekodiert.
+
+    Wird die Welt neu angelegt (Setup-Notebook, world_loader --reset),
+    fangen die emb_versions wieder bei 0 bzw. 1 an. Deshalb gehört der Store
+    zu einer Welt-Generation (use_generation), bei einer neuen Generation
+    wird er geleert.
+    """
+
+    def __init__(self, name):
+        self.matrix_path = cache_dir() / f'{name}.npy'
+        self.index_path = cache_dir() / f'{name}.json'
+
+        self._index = {}       # id -> {'version': int, 'rows': {field: zeile}}
+        self._matrix = None    # memory-mapped Zeilen aus der Datei
+        self._new_rows = []    # seit dem Laden hinzugekommene Zeilen
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        self.generation = None          # Generation der DB, gesetzt über use_generation
+        self._stored_generation = None  # Generation, zu der die Datei gehört
+
+        self._load()
+
+    @classmethod
+    def for_uri(cls, uri):
+        """eigener Store pro Datenbank, damit sich Welten nicht vermischen"""
+        digest = hashlib.sha256((uri or '').encode('utf-8')).hexdigest()[:12]
+        return cls(f'entity_emb_{digest}')
+
+    def __len__(self):
+        return len(self._index)
+
+    def _load(self):
+        if not (self.matrix_path.exists() and self.index_path.exists()):
+            return
+        try:
+            self._matrix = np.load(self.matrix_path, mmap_mode='r')
+            with open(self.index_path, encoding='utf-8') as f:
+                data = json.load(f)
+            # ältere Dateien ohne Generation werden wie eine fremde Welt behandelt
+            self._stored_generation = data.get('generation')
+            self._index = data.get('nodes', {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"Embedding-Store {self.matrix_path} unlesbar, starte leer: {e}")
+            self._matrix, self._index = None, {}
+
+    def use_generation(self, generation):
+        """
+        bindet den Store an die Welt-Generation der DB, Embeddings einer
+        anderen Generation werden verworfen
+
+        args:
+            generation (str): World.generation aus der DB (queries.WORLD_GENERATION)
+        """
+        with self._lock:
+            if generation != self._stored_generation:
+                if self._index:
+                    logging.info(f"Neue Welt-Generation {generation}, Embedding-Store {self.matrix_path.name} wird geleert")
+                self._index, self._matrix, self._new_rows = {}, None, []
+                self._stored_generation = generation
+                self._dirty = True
+            self.generation = generation
+
+    def _row_count(self):
+        return (0 if self._matrix is None else len(self._matrix)) + len(self._new_rows)
+
+    def _row(self, row):
+        stored = 0 if self._matrix is None else len(self._matrix)
+        if row < stored:
+            return self._matrix[row]
+        return self._new_rows[row - stored]
+
+    def missing(self, rows):
+        """
+        ids aus Query-Ergebnissen, deren Embeddings fehlen oder veraltet sind
+
+        args:
+            rows (list): dicts mit 'id' und 'emb_version'
+        """
+        with self._lock:
+            return sorted({
+                row['id'] for row in rows
+                if row.get('id') is not None
+                and (row['id'] not in self._index
+                     or self._index[row['id']]['version'] != (row.get('emb_version') or 0))
+            })
+
+    def ingest(self, records):
+        """
+        übernimmt Embeddings aus der DB
+
+        args:
+            records (list): dicts mit 'id', 'emb_version', EMB_FIELDS und ggf. <feld>_scale
+        """
+        with self._lock:
+            for record in records:
+                rows = {}
+                for field in EMB_FIELDS:
+                    vector = decode_embedding(record.get(field), record.get(scale_field(field)))
+                    if vector is None:
+                        continue
+                    vector.setflags(write=False)
+                    rows[field] = self._row_count()
+                    self._new_rows.append(vector)
+
+                self._index[record['id']] = {'version': record.get('emb_version') or 0, 'rows': rows}
+                self._dirty = True
+
+    def attach(self, rows):
+        """
+        ergänzt Query-Ergebnisse um die lokalen Embeddings
+
+        returns:
+            list: neue dicts mit zusätzlichen *_emb Feldern (read-only np.ndarray)
+        """
+        with self._lock:
+            result = []
+            for row in rows:
+                entry = self._index.get(row.get('id'))
+                attached = dict(row)
+                if entry is not None:
+                    for field, index in entry['rows'].items():
+                        attached[field] = self._row(index)
+                result.append(attached)
+            return result
+
+    def flush(self):
+        """schreibt Store kompaktiert auf Platte (nur Zeilen, die noch referenziert werden)"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            vectors, index = [], {}
+            for node_id, entry in self._index.items():
+                rows = {}
+                for field, row in entry['rows'].items():
+                    rows[field] = len(vectors)
+                    vectors.append(self._row(row))
+                index[node_id] = {'version': entry['version'], 'rows': rows}
+
+            if not vectors:
+                return
+
+            matrix = np.ascontiguousarray(np.stack(vectors), dtype=np.float32)
+
+            try:
+                self.matrix_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_matrix = self.matrix_path.with_name(f'{self.matrix_path.name}.{os.getpid()}.tmp')
+                tmp_index = self.index_path.with_name(f'{self.index_path.name}.{os.getpid()}.tmp')
+                with open(tmp_matrix, 'wb') as f:
+                    np.save(f, matrix)
+                with open(tmp_index, 'w', encoding='utf-8') as f:
+                    json.dump({'generation': self._stored_generation, 'nodes': index}, f)
+                os.replace(tmp_matrix, self.matrix_path)
+                os.replace(tmp_index, self.index_path)
+            except OSError as e:
+                # z.B. Windows: Datei ist noch gemappt
+                logging.warning(f"Embedding-Store konnte nicht gespeichert werden: {e}")
+                return
+
+            self._matrix = np.load(self.matrix_path, mmap_mode='r')
+            self._index = index
+            self._new_rows = []
+            self._dirty = False
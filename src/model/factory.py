@@ -0,0 +1,31 @@
+import os
+from dotenv import load_dotenv
+
+BACKENDS = ('neo4j', 'memory')
+
+
+def create_model(backend=None, cache=None):
+    """
+    erzeugt das Model für die Spielwelt
+
+    args:
+        backend (str): 'neo4j' oder 'memory' (default: GAME_BACKEND aus .env)
+        cache (bool): Zustands-Cache (und damit Prefetch) des GameModels
+            (default: GAME_STATE_CACHE aus .env, memory-Backend hat keinen Cache)
+
+    returns:
+        GameModel oder MemoryGameModel
+    """
+    load_dotenv()
+    backend = backend or os.getenv('GAME_BACKEND', 'neo4j')
+
+    # Imports erst hier, damit das Memory-Backend ohne neo4j-Paket läuft
+    if backend == 'neo4j':
+        from model.game_model import GameModel
+        return GameModel(cache=cache)
+
+    if backend == 'memory':
+        from model.memory_model import MemoryGameModel
+        return MemoryGameModel()
+
+    raise ValueError(f"Unbekanntes GAME_BACKEND '{backend}', erlaubt: {BACKENDS}")
@@ -1,14 +1,70 @@
 import os
+import time
+import logging
+import itertools
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
+from neo4j.exceptions import Neo4jError, ServiceUnavailable, SessionExpired
+from model import queries, schema
+from model.connection import PoolStats, driver_config, session_config
+from model.embedding_store import EmbeddingStore
+from model.savegame import GameSnapshot, STATE_FLAGS
+from model.prefetch import RoomPrefetcher, PREFETCH_CACHE_SIZE
+from utils.tracing import span
+
+# Teile des Spielzustands, wie sie snapshot() liefert
+STATE_KEYS = ('location', 'items', 'exits', 'inventory')
 
 
 class GameModel:
-    def __init__(self):
+    """
+    Spielwelt in Neo4j aus Sicht eines Spielers.
+
+    Jedes GameModel hält eine eigene, langlebige Session (nicht thread-safe:
+    ein GameModel pro Thread bzw. Spieler, weitere über with_player). Lesen
+    läuft über execute_read, Schreiben über execute_write - im Cluster
+    (neo4j://) gehen Reads an die Reader, Writes an den Leader, transiente
+    Fehler wiederholt der Driver.
+    """
+
+    def __init__(self, cache=None, cache_check=None, player_id=queries.PLAYER_ID,
+                 driver=None, embeddings=None, pool_stats=None):
+        """
+        args:
+            cache (bool): Write-Through Cache für den Spielzustand
+                (default: GAME_STATE_CACHE aus .env)
+            cache_check (bool): Cache bei jedem snapshot() gegen die DB prüfen
+                (default: GAME_STATE_CACHE_CHECK aus .env)
+            player_id (str): id des Player-Nodes, aus dessen Sicht gespielt wird
+            driver, embeddings, pool_stats: von einem anderen GameModel
+                übernehmen (siehe with_player), werden dann hier nicht geschlossen
+        """
         # .env laden
         load_dotenv()
 
-        # DB driver erstellen
+        if cache is None:
+            cache = os.getenv('GAME_STATE_CACHE', '0') == '1'
+        if cache_check is None:
+            cache_check = os.getenv('GAME_STATE_CACHE_CHECK', '0') == '1'
+
+        self.cache_enabled = cache
+        self.cache_check = cache_check
+
+        # Gecachter Zustand, fehlende Keys gelten als ungültig
+        self._cache = {}
+
+        self.player_id = player_id
+        self._owns_driver = driver is None
+        self._session = None
+        self.prefetcher = None
+
+        if driver is not None:
+            self.driver = driver
+            self.embeddings = embeddings
+            self.pool_stats = pool_stats
+            return
+
+        # DB driver erstellen, Pool-Größe & Timeouts aus .env (model/connection.py)
         self.driver = GraphDatabase.driver(
             uri=os.getenv('NEO4J_URI'),
             auth=(
@@ -16,110 +72,373 @@ class GameModel:
                 os.getenv('NEO4J_PASSWORD')
             ),
             # notifications_min_severity='OFF'
+            **driver_config()
         )
+        self.pool_stats = PoolStats()
+
+        # id-Constraints anlegen, sonst werden die {id: ...} Lookups zu Label-Scans
+        if os.getenv('GAME_SCHEMA_BOOTSTRAP', '1') == '1':
+            try:
+                schema.bootstrap(self.driver)
+            except Neo4jError as e:
+                logging.warning(f"Schema-Bootstrap fehlgeschlagen: {e}")
+
+        # Embeddings lokal statt pro Zug über Bolt, gültig für die aktuelle Welt-Generation
+        self.embeddings = EmbeddingStore.for_uri(os.getenv('NEO4J_URI'))
+        self.embeddings.use_generation(self.world_generation())
+        if os.getenv('EMBEDDING_PRELOAD', '0') == '1':
+            self.preload_embeddings()
+
+        # Nachbar-Räume laden, während der Spieler tippt (baut auf dem Zustands-Cache auf)
+        if os.getenv('GAME_PREFETCH', '0') == '1':
+            if cache:
+                self._prefetch_model = self.with_player(player_id)
+                self.prefetcher = RoomPrefetcher(
+                    self._load_rooms,
+                    capacity=int(os.getenv('GAME_PREFETCH_SIZE') or PREFETCH_CACHE_SIZE)
+                )
+            else:
+                logging.warning("GAME_PREFETCH braucht GAME_STATE_CACHE=1, Prefetch ist aus")
 
     def close(self):
+        self._close_session()
+        if not self._owns_driver:
+            return
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+            self._prefetch_model.close()
+            logging.info("Prefetch: %s", self.prefetcher.metrics())
+        self.embeddings.flush()
         self.driver.close()
+
+    def _close_session(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def with_player(self, player_id):
+        """
+        GameModel für einen weiteren Spieler auf dem gleichen Driver
+        (Connection Pool) und Embedding-Store
+        """
+        return GameModel(
+            cache=self.cache_enabled,
+            cache_check=self.cache_check,
+            player_id=player_id,
+            driver=self.driver,
+            embeddings=self.embeddings,
+            pool_stats=self.pool_stats
+        )
+
+    def world_generation(self):
+        """Generation der Welt in der DB (legt den World-Node beim ersten Start an)"""
+        return self._run_query(queries.WORLD_GENERATION, write=True)[0]['generation']
+
+    def ensure_player(self, start=None):
+        """
+        legt den Player-Node an, falls es ihn noch nicht gibt, und stellt ihn
+        auf die Start-Location (default: GAME_START_LOCATION aus .env)
+        """
+        start = start or os.getenv('GAME_START_LOCATION') or queries.START_LOCATION
+        self.invalidate()
+        return self._run_query(queries.ENSURE_PLAYER, {'start': start}, write=True)
     
-    def _run_query(self, query, params=None):
+    def _run_query(self, query, params=None, write=False):
         """
-        führt eine einzelne Query aus
+        führt eine Query als verwaltete Transaktion in der Session des Models aus
 
         args:
             query (str): cypher query
-            params (dict): queryparameter
+            params (dict): queryparameter ($player_id wird ergänzt)
+            write (bool): execute_write statt execute_read
 
         returns:
             list: liste von dicts mit den ergebnissen
         """
-        with self.driver.session() as session:
+        return self._run_queries([(query, params)], write=write)[0]
 
-            result = session.run(query, params or {})
-            return [record.data() for record in result]
+    def _run_queries(self, statements, write=False):
+        """
+        führt mehrere Queries nacheinander in einer Transaktion aus (alles oder nichts)
 
-    def current_location(self):
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(location:Location)
-        RETURN 
-            location.id AS id, 
-            location.name AS name, 
-            location.description AS description,
-            location.name_emb AS name_emb
+        args:
+            statements (list): [(query, params)], $player_id wird jeweils ergänzt
+            write (bool): execute_write statt execute_read
+
+        returns:
+            list: pro Query eine liste von dicts mit den ergebnissen
         """
-        return self._run_query(query)
+        statements = [(query, {'player_id': self.player_id, **(params or {})}) for query, params in statements]
+        requested = time.perf_counter()
+        attempts = itertools.count()
+
+        def work(tx):
+            # wird bei transienten Fehlern vom Driver erneut aufgerufen
+            self.pool_stats.started(requested, next(attempts))
+            return [[record.data() for record in tx.run(query, params)] for query, params in statements]
+
+        if self._session is None:
+            self._session = self.driver.session(**session_config())
+
+        name = '+'.join(schema.query_name(query) for query, _ in statements)
+        try:
+            with span('db.' + name, write=write):
+                if write:
+                    return self._session.execute_write(work)
+                return self._session.execute_read(work)
+        except (ServiceUnavailable, SessionExpired):
+            # Session verwerfen, die nächste Query öffnet eine neue
+            self._close_session()
+            raise
+
+    def preload_embeddings(self):
+        """lädt die Embeddings aller Locations, Items und NPCs in den lokalen Store"""
+        self.embeddings.ingest(self._run_query(queries.ALL_EMBEDDINGS))
+        self.embeddings.flush()
+
+    def _with_embeddings(self, rows):
+        """
+        ergänzt Query-Ergebnisse um name_emb/synonyms_emb/description_emb
+        aus dem lokalen Store, fehlende ids werden in einer Query nachgeladen
+        """
+        missing = self.embeddings.missing(rows)
+        if missing:
+            self.embeddings.ingest(self._run_query(queries.EMBEDDINGS, {'ids': missing}))
+        return self.embeddings.attach(rows)
+
+    def current_location(self):
+        return self._with_embeddings(self._run_query(queries.CURRENT_LOCATION))
 
     def location_content(self):
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(loc:Location)
-        MATCH (item)-[:IST_IN]->(loc)
-        WHERE item <> p
-        RETURN 
-            item.id AS id, 
-            item.name AS name, 
-            item.description AS description,
-            item.name_emb AS name_emb
-        """
-        return self._run_query(query)
+        return self._with_embeddings(self._run_query(queries.LOCATION_CONTENT))
 
     def location_exits(self):
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(location:Location)
-        MATCH (location)-[:ERREICHT]->(exit:Location)
-        RETURN
-            exit.id AS id, 
-            exit.name AS name, 
-            exit.description AS description,
-            exit.name_emb AS name_emb
-        """
-        return self._run_query(query)
+        return self._with_embeddings(self._run_query(queries.LOCATION_EXITS))
 
     def player_inventory(self):
-        query = """
-        MATCH (p:Player {id: 'player'})-[:TRÄGT]->(inventory:Item)
-        RETURN 
-            inventory.id AS id,
-            inventory.name AS name,
-            inventory.name_emb AS name_emb
+        return self._with_embeddings(self._run_query(queries.PLAYER_INVENTORY))
+
+    def snapshot(self):
         """
-        return self._run_query(query)
+        liefert Location, Items, Exits und Inventar
 
-    def move_player(self, to_location):
-        query = """
-        MATCH (p:Player {id: 'player'})-[old:IST_IN]->(current:Location)
-        MATCH (current)-[:ERREICHT]->(target:Location {id: $to_location})
-        DELETE old
-        CREATE (p)-[:IST_IN]->(target)
-        RETURN
-            target.id AS id, 
-            target.name AS name, 
-            target.description AS description
+        Ohne Cache ein einziger Round Trip. Mit Cache werden nur die Teile
+        nachgeladen, die seit dem letzten Aufruf invalidiert wurden.
+
+        returns:
+            dict: location, items, exits, inventory (gleiche Form wie die
+            Einzel-Queries)
         """
-        params = {'to_location': to_location}
-        return self._run_query(query, params=params)
+        if not self.cache_enabled:
+            return self._state_with_embeddings(self._load_snapshot())
 
-    def take_item(self, item):
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(loc:Location)
-        MATCH (i:Item {id: $item})-[old:IST_IN]->(loc)
-        DELETE old
-        CREATE (p)-[:TRÄGT]->(i)
-        RETURN i.name AS name
+        missing = {key for key in STATE_KEYS if key not in self._cache}
+
+        if missing == {'inventory'}:
+            self._cache['inventory'] = self._run_query(queries.PLAYER_INVENTORY)
+        elif missing and missing <= {'items', 'exits'}:
+            self._cache.update(self._load_room())
+        elif missing:
+            self._cache = self._load_snapshot()
+
+        if self.cache_check:
+            self.verify_cache()
+
+        if self.prefetcher is not None:
+            self.prefetcher.schedule([row['id'] for row in self._cache['exits']])
+
+        return self._state_with_embeddings(self._cache)
+
+    def _state_with_embeddings(self, state):
+        """wie _with_embeddings, für alle Teile des Zustands mit einer Query"""
+        missing = self.embeddings.missing([row for key in STATE_KEYS for row in state[key]])
+        if missing:
+            self.embeddings.ingest(self._run_query(queries.EMBEDDINGS, {'ids': missing}))
+        return {key: self.embeddings.attach(state[key]) for key in STATE_KEYS}
+
+    def invalidate(self, *keys):
         """
+        markiert Teile des gecachten Zustands als ungültig
 
+        args:
+            keys (str): Teile aus STATE_KEYS, ohne Angabe alles
+        """
+        for key in keys or STATE_KEYS:
+            self._cache.pop(key, None)
+
+    def verify_cache(self):
+        """
+        vergleicht den Cache mit der Datenbank und übernimmt bei Abweichung
+        den Stand der Datenbank
+
+        returns:
+            list: Keys, deren Inhalt abweicht
+        """
+        fresh = self._load_snapshot()
+
+        def normalize(rows):
+            return sorted(rows, key=lambda row: row['id'])
+
+        mismatches = [
+            key for key in STATE_KEYS
+            if key in self._cache and normalize(self._cache[key]) != normalize(fresh[key])
+        ]
+
+        if mismatches:
+            logging.warning(f"Cache weicht von der DB ab: {mismatches}")
+            self._cache = fresh
+
+        return mismatches
+
+    def _load_room(self):
+        """lädt Items und Exits der aktuellen Location in einem Round Trip"""
+        result = self._run_query(queries.ROOM)
+
+        if not result:
+            return {'items': [], 'exits': []}
+
+        return result[0]
+
+    def _load_rooms(self, location_ids):
+        """
+        Items und Exits mehrerer Locations in einem Round Trip (Prefetch-Thread,
+        eigene Session), fehlende Embeddings landen gleich im Store
+
+        returns:
+            dict: Location-id -> {'items', 'exits'}
+        """
+        model = self._prefetch_model
+        result = model._run_query(queries.ROOMS, {'ids': location_ids})
+
+        missing = self.embeddings.missing([row for room in result for key in ('items', 'exits') for row in room[key]])
+        if missing:
+            self.embeddings.ingest(model._run_query(queries.EMBEDDINGS, {'ids': missing}))
+
+        return {room['id']: {'items': room['items'], 'exits': room['exits']} for room in result}
+
+    def _invalidate_prefetch(self):
+        """eigene Änderung am aktuellen Raum: vorgeladene Stände können veraltet sein"""
+        if self.prefetcher is not None:
+            self.prefetcher.invalidate(*[row['id'] for row in self._cache.get('location', [])])
+
+    def _load_snapshot(self):
+        """lädt den kompletten Spielzustand in einem Round Trip"""
+        result = self._run_query(queries.SNAPSHOT)
+
+        if not result:
+            return {'location': [], 'items': [], 'exits': [], 'inventory': []}
+
+        return result[0]
+
+    def move_player(self, to_location):
+        params = {'to_location': to_location}
+        result = self._run_query(queries.MOVE_PLAYER, params=params, write=True)
+
+        if self.cache_enabled:
+            # Vorgeladenen Raum übernehmen, sonst Raum-Inhalt neu laden
+            room = self.prefetcher.take(to_location) if result and self.prefetcher is not None else None
+
+            if result:
+                # Neue Location direkt übernehmen
+                self._cache['location'] = result
+                if room is not None:
+                    self._cache.update(room)
+                else:
+                    self.invalidate('items', 'exits')
+            else:
+                self.invalidate('location', 'items', 'exits')
+
+        return result
+
+    def take_item(self, item):
         params = {'item': item}
-        return self._run_query(query, params=params)
+        result = self._run_query(queries.TAKE_ITEM, params=params, write=True)
+
+        if self.cache_enabled:
+            self._invalidate_prefetch()
+            if result and 'items' in self._cache and 'inventory' in self._cache:
+                taken = result[0]
+                self._cache['items'] = [x for x in self._cache['items'] if x['id'] != taken['id']]
+                self._cache['inventory'].append({
+                    key: value for key, value in taken.items() if key != 'description'
+                })
+            else:
+                self.invalidate('items', 'inventory')
+
+        return result
 
     def drop_item(self, item):
-        query = """
-        MATCH (p:Player {id: 'player'})-[old:TRÄGT]->(i:Item {id: $item})
-        MATCH (p)-[:IST_IN]->(loc:Location)
-        DELETE old
-        CREATE (i)-[:IST_IN]->(loc)
-        RETURN i.name AS name
+        params = {'item': item}
+        result = self._run_query(queries.DROP_ITEM, params=params, write=True)
+
+        if self.cache_enabled:
+            self._invalidate_prefetch()
+            if result and 'items' in self._cache and 'inventory' in self._cache:
+                dropped = result[0]
+                self._cache['inventory'] = [x for x in self._cache['inventory'] if x['id'] != dropped['id']]
+                self._cache['items'].append(dropped)
+            else:
+                self.invalidate('items', 'inventory')
+
+        return result
+
+    def export_world(self):
         """
+        liest die komplette Welt (alle Nodes und Relationships)
 
-        params = {'item': item}
-        return self._run_query(query, params=params)
+        returns:
+            dict: nodes und relationships im Format von MemoryWorld
+        """
+        nodes = self._run_query("""
+        MATCH (n)
+        WHERE NOT n:World
+        RETURN labels(n) AS labels, properties(n) AS properties
+        """)
+        relationships = self._run_query("""
+        MATCH (a)-[r]->(b)
+        RETURN a.id AS from, type(r) AS type, b.id AS to
+        """)
+        return {'nodes': nodes, 'relationships': relationships}
+
+    def save_state(self):
+        """
+        liest den veränderlichen Spielstand (Player, IST_IN, TRÄGT, Flags)
+        in einer Lese-Transaktion
+
+        returns:
+            GameSnapshot
+        """
+        players, edges, flags = self._run_queries([
+            (queries.SAVE_PLAYERS, None),
+            (queries.SAVE_EDGES, None),
+            (queries.SAVE_FLAGS, None),
+        ])
+        return GameSnapshot(
+            players=[(row['id'], row['name']) for row in players],
+            edges=[(row['from'], row['type'], row['to']) for row in edges],
+            flags=[
+                (row['id'], prop, row[prop])
+                for row in flags for prop in STATE_FLAGS if row[prop] is not None
+            ]
+        )
+
+    def restore_state(self, snapshot):
+        """
+        setzt den Spielstand aus einem GameSnapshot in einer Transaktion,
+        Embeddings und alle übrigen Properties bleiben unberührt
+        """
+        rows = snapshot.rows()
+        self._run_queries([
+            (queries.RESTORE_CLEAR_EDGES, None),
+            (queries.RESTORE_PLAYERS, {'players': rows['players']}),
+            (queries.RESTORE_LOCATED, {'rows': rows['located']}),
+            (queries.RESTORE_CARRIED, {'rows': rows['carried']}),
+            (queries.RESTORE_CLEAR_FLAGS, None),
+            (queries.RESTORE_FLAGS, {'rows': rows['flags']}),
+        ], write=True)
+        self.invalidate()
+        if self.prefetcher is not None:
+            self.prefetcher.invalidate()
 
     def use_item(self, item, target):
         pass
@@ -0,0 +1,369 @@
+"""
+In-Memory Backend für die Spielwelt (ohne Neo4j).
+
+Hält Nodes und die Relationships IST_IN, TRÄGT und ERREICHT in indizierten
+dicts und bietet die gleichen Methoden wie GameModel. Die Welt wird aus einer
+JSON-Datei geladen und kann wieder dorthin geschrieben werden.
+
+Welt aus Neo4j exportieren (aus src/):
+    python -m model.memory_model export ../data/worlds/world.json
+"""
+import os
+import sys
+import json
+import base64
+import threading
+from pathlib import Path
+
+from model.queries import PLAYER_ID, START_LOCATION
+from model.savegame import GameSnapshot, STATE_FLAGS
+
+DEFAULT_WORLD_FILE = Path(__file__).resolve().parents[2] / 'data' / 'worlds' / 'world.json'
+
+# Felder wie in den RETURN-Klauseln von model/queries.py (+ Embeddings, ohne Store)
+EMB_FIELDS = (
+    'name_emb', 'name_emb_scale',
+    'synonyms_emb', 'synonyms_emb_scale',
+    'description_emb', 'description_emb_scale'
+)
+LOCATION_FIELDS = ('id', 'name', 'description', 'name_emb', 'name_emb_scale')
+ENTITY_FIELDS = ('id', 'name', 'description') + EMB_FIELDS
+INVENTORY_FIELDS = ('id', 'name') + EMB_FIELDS
+
+
+def _json_default(value):
+    """bytes (quantisierte Embeddings) als base64 in die JSON-Datei"""
+    if isinstance(value, (bytes, bytearray)):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"{type(value).__name__} ist nicht JSON-serialisierbar")
+
+
+def _json_bytes(obj):
+    if len(obj) == 1 and '$bytes' in obj:
+        return base64.b64decode(obj['$bytes'])
+    return obj
+
+
+class MemoryWorld:
+    """
+    Graph im Speicher
+
+    nodes:       id -> {'labels': set, 'props': dict}
+    location_of: id -> Location-id           (IST_IN)
+    contents:    Location-id -> {id: None}   (IST_IN rückwärts, geordnet)
+    carried_by:  Item-id -> Träger-id        (TRÄGT)
+    carries:     Träger-id -> {Item-id: None}
+    exits:       Location-id -> [Location-id] (ERREICHT)
+    other_rels:  übrige Relationships, nur zum Speichern
+
+    lock: mehrere MemoryGameModels (Server, ein Spieler pro Session) teilen
+    sich eine Welt und greifen aus Worker-Threads zu
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.nodes = {}
+        self.location_of = {}
+        self.contents = {}
+        self.carried_by = {}
+        self.carries = {}
+        self.exits = {}
+        self.other_rels = []
+
+    @classmethod
+    def from_dict(cls, data):
+        world = cls()
+
+        for node in data.get('nodes', []):
+            props = dict(node['properties'])
+            if 'id' not in props:
+                continue
+            world.nodes[props['id']] = {'labels': set(node['labels']), 'props': props}
+
+        for rel in data.get('relationships', []):
+            world.add_relationship(rel['from'], rel['type'], rel['to'])
+
+        return world
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f, object_hook=_json_bytes))
+
+    def to_dict(self):
+        relationships = [
+            {'from': node_id, 'type': 'IST_IN', 'to': location_id}
+            for node_id, location_id in self.location_of.items()
+        ]
+        relationships += [
+            {'from': holder_id, 'type': 'TRÄGT', 'to': item_id}
+            for item_id, holder_id in self.carried_by.items()
+        ]
+        relationships += [
+            {'from': location_id, 'type': 'ERREICHT', 'to': exit_id}
+            for location_id, exit_ids in self.exits.items()
+            for exit_id in exit_ids
+        ]
+        relationships += [
+            {'from': from_id, 'type': rel_type, 'to': to_id}
+            for from_id, rel_type, to_id in self.other_rels
+        ]
+
+        return {
+            'nodes': [
+                {'labels': sorted(node['labels']), 'properties': node['props']}
+                for node in self.nodes.values()
+            ],
+            'relationships': relationships
+        }
+
+    def dump(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, default=_json_default)
+        os.replace(tmp_path, path)
+
+    def add_relationship(self, from_id, rel_type, to_id):
+        if from_id not in self.nodes or to_id not in self.nodes:
+            raise ValueError(f"Relationship {from_id}-[:{rel_type}]->{to_id}: Node fehlt")
+
+        if rel_type == 'IST_IN':
+            self.place(from_id, to_id)
+        elif rel_type == 'TRÄGT':
+            self.give(to_id, from_id)
+        elif rel_type == 'ERREICHT':
+            self.exits.setdefault(from_id, []).append(to_id)
+        else:
+            self.other_rels.append((from_id, rel_type, to_id))
+
+    def has_label(self, node_id, label):
+        node = self.nodes.get(node_id)
+        return node is not None and label in node['labels']
+
+    def _detach(self, node_id):
+        """entfernt IST_IN und TRÄGT eines Nodes"""
+        location_id = self.location_of.pop(node_id, None)
+        if location_id is not None:
+            self.contents[location_id].pop(node_id, None)
+
+        holder_id = self.carried_by.pop(node_id, None)
+        if holder_id is not None:
+            self.carries[holder_id].pop(node_id, None)
+
+    def place(self, node_id, location_id):
+        """(node)-[:IST_IN]->(location), ersetzt bisherige Platzierung"""
+        self._detach(node_id)
+        self.location_of[node_id] = location_id
+        self.contents.setdefault(location_id, {})[node_id] = None
+
+    def give(self, item_id, holder_id):
+        """(holder)-[:TRÄGT]->(item), ersetzt bisherige Platzierung"""
+        self._detach(item_id)
+        self.carried_by[item_id] = holder_id
+        self.carries.setdefault(holder_id, {})[item_id] = None
+
+    def view(self, node_id, *fields):
+        """neues dict mit den gewünschten Properties (wie RETURN n.x AS x)"""
+        props = self.nodes[node_id]['props']
+        return {field: props.get(field) for field in fields}
+
+
+class MemoryGameModel:
+    """
+    GameModel-Schnittstelle auf einer MemoryWorld.
+
+    Liefert die gleichen Listen von dicts wie die Neo4j-Queries, ohne
+    Netzwerk und ohne Serialisierung.
+    """
+
+    def __init__(self, world=None, world_file=None, player_id=PLAYER_ID):
+        """
+        args:
+            world (MemoryWorld): bereits geladene Welt
+            world_file (str): JSON-Datei (default: GAME_WORLD_FILE aus .env)
+            player_id (str): id des Player-Nodes, aus dessen Sicht gespielt wird
+        """
+        if world is None:
+            world_file = world_file or os.getenv('GAME_WORLD_FILE') or DEFAULT_WORLD_FILE
+            world = MemoryWorld.load(world_file)
+
+        self.world = world
+        self.world_file = world_file
+        self.player_id = player_id
+
+    def close(self):
+        pass
+
+    def dump(self, path=None):
+        """schreibt die Welt (inkl. aktuellem Spielstand) in eine JSON-Datei"""
+        with self.world.lock:
+            self.world.dump(path or self.world_file)
+
+    def with_player(self, player_id):
+        """MemoryGameModel für einen weiteren Spieler auf der gleichen Welt"""
+        return MemoryGameModel(world=self.world, world_file=self.world_file, player_id=player_id)
+
+    def ensure_player(self, start=None):
+        """legt den Player-Node an und stellt ihn auf die Start-Location"""
+        start = start or os.getenv('GAME_START_LOCATION') or START_LOCATION
+        with self.world.lock:
+            if self.player_id not in self.world.nodes:
+                self.world.nodes[self.player_id] = {
+                    'labels': {'Player'},
+                    'props': {'id': self.player_id, 'name': self.player_id}
+                }
+            if self._location_id() is not None or not self.world.has_label(start, 'Location'):
+                return []
+            self.world.place(self.player_id, start)
+            return [{'id': start}]
+
+    def _location_id(self):
+        return self.world.location_of.get(self.player_id)
+
+    def current_location(self):
+        with self.world.lock:
+            location_id = self._location_id()
+            if location_id is None:
+                return []
+            return [self.world.view(location_id, *LOCATION_FIELDS)]
+
+    def location_content(self):
+        with self.world.lock:
+            location_id = self._location_id()
+            if location_id is None:
+                return []
+            return [
+                self.world.view(node_id, *ENTITY_FIELDS)
+                for node_id in self.world.contents.get(location_id, {})
+                if not self.world.has_label(node_id, 'Player')
+            ]
+
+    def location_exits(self):
+        with self.world.lock:
+            location_id = self._location_id()
+            if location_id is None:
+                return []
+            return [
+                self.world.view(exit_id, *ENTITY_FIELDS)
+                for exit_id in self.world.exits.get(location_id, [])
+                if self.world.has_label(exit_id, 'Location')
+            ]
+
+    def player_inventory(self):
+        with self.world.lock:
+            return [
+                self.world.view(item_id, *INVENTORY_FIELDS)
+                for item_id in self.world.carries.get(self.player_id, {})
+                if self.world.has_label(item_id, 'Item')
+            ]
+
+    def snapshot(self):
+        with self.world.lock:
+            return {
+                'location': self.current_location(),
+                'items': self.location_content(),
+                'exits': self.location_exits(),
+                'inventory': self.player_inventory()
+            }
+
+    def move_player(self, to_location):
+        with self.world.lock:
+            location_id = self._location_id()
+            if location_id is None or to_location not in self.world.exits.get(location_id, []):
+                return []
+            if not self.world.has_label(to_location, 'Location'):
+                return []
+
+            self.world.place(self.player_id, to_location)
+            return [self.world.view(to_location, *LOCATION_FIELDS)]
+
+    def take_item(self, item):
+        with self.world.lock:
+            location_id = self._location_id()
+            if not self.world.has_label(item, 'Item') or self.world.location_of.get(item) != location_id:
+                return []
+
+            self.world.give(item, self.player_id)
+            return [self.world.view(item, *ENTITY_FIELDS)]
+
+    def drop_item(self, item):
+        with self.world.lock:
+            location_id = self._location_id()
+            if location_id is None or self.world.carried_by.get(item) != self.player_id:
+                return []
+            if not self.world.has_label(item, 'Item'):
+                return []
+
+            self.world.place(item, location_id)
+            return [self.world.view(item, *ENTITY_FIELDS)]
+
+    def save_state(self):
+        """veränderlicher Spielstand (Player, IST_IN, TRÄGT, Flags) als GameSnapshot"""
+        with self.world.lock:
+            nodes = self.world.nodes
+            return GameSnapshot(
+                players=[
+                    (node_id, node['props'].get('name'))
+                    for node_id, node in nodes.items() if 'Player' in node['labels']
+                ],
+                edges=[
+                    (node_id, 'IST_IN', location_id) for node_id, location_id in self.world.location_of.items()
+                ] + [
+                    (holder_id, 'TRÄGT', item_id) for item_id, holder_id in self.world.carried_by.items()
+                ],
+                flags=[
+                    (node_id, prop, node['props'][prop])
+                    for node_id, node in nodes.items()
+                    if node['labels'] & {'Item', 'Location'}
+                    for prop in STATE_FLAGS if node['props'].get(prop) is not None
+                ]
+            )
+
+    def restore_state(self, snapshot):
+        """setzt den Spielstand aus einem GameSnapshot, Embeddings bleiben unberührt"""
+        world = self.world
+        with world.lock:
+            for player_id, name in snapshot.players:
+                world.nodes.setdefault(player_id, {'labels': {'Player'}, 'props': {'id': player_id, 'name': name}})
+
+            world.location_of.clear()
+            world.contents.clear()
+            world.carried_by.clear()
+            world.carries.clear()
+            for from_id, rel_type, to_id in snapshot.edges:
+                if from_id in world.nodes and to_id in world.nodes:
+                    world.add_relationship(from_id, rel_type, to_id)
+
+            for node in world.nodes.values():
+                if node['labels'] & {'Item', 'Location'}:
+                    for prop in STATE_FLAGS:
+                        node['props'].pop(prop, None)
+            for node_id, prop, value in snapshot.flags:
+                if node_id in world.nodes:
+                    world.nodes[node_id]['props'][prop] = value
+
+    def use_item(self, item, target):
+        pass
+
+
+def export_neo4j(path):
+    """exportiert die komplette Welt aus Neo4j (.env) in eine JSON-Datei"""
+    from model.game_model import GameModel
+
+    model = GameModel()
+    try:
+        data = model.export_world()
+    finally:
+        model.close()
+
+    MemoryWorld.from_dict(data).dump(path)
+    print(f"{len(data['nodes'])} Nodes, {len(data['relationships'])} Relationships -> {path}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == 'export':
+        export_neo4j(sys.argv[2])
+    else:
+        print(__doc__)
@@ -0,0 +1,134 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Anzahl vorgeladener Räume (Items + Exits einer Location)
+PREFETCH_CACHE_SIZE = 64
+
+
+class RoomPrefetcher:
+    """
+    Lädt Items und Exits der Nachbar-Locations im Hintergrund, während der
+    Spieler tippt. Nach move_player kommt der neue Raum dann aus dem Cache
+    statt aus der DB.
+
+    Ein Raum wird beim Betreten entnommen (take), danach kann der Spieler
+    ihn selbst verändern. Eigene Änderungen (invalidate) verwerfen außerdem
+    alle noch laufenden Loads, damit kein veralteter Stand im Cache landet.
+    Änderungen anderer Spieler sieht der Cache nicht (Server: aus).
+    """
+
+    def __init__(self, load_rooms, capacity=PREFETCH_CACHE_SIZE):
+        """
+        args:
+            load_rooms: Funktion ids -> {id: {'items', 'exits'}}, läuft im Prefetch-Thread
+            capacity (int): max. Räume im Cache, älteste fliegen raus (LRU)
+        """
+        self.load_rooms = load_rooms
+        self.capacity = capacity
+
+        self._rooms = OrderedDict()
+        self._pending = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+
+        self.hits = 0
+        self.misses = 0
+        self.loaded = 0
+        self.evictions = 0
+        self.discarded = 0
+
+    def schedule(self, location_ids):
+        """
+        lädt die Räume, die weder im Cache sind noch gerade geladen werden
+
+        returns:
+            Future oder None, falls nichts zu laden ist
+        """
+        with self._lock:
+            ids = []
+            for location_id in dict.fromkeys(location_ids):
+                if location_id in self._rooms:
+                    self._rooms.move_to_end(location_id)
+                elif location_id not in self._pending:
+                    ids.append(location_id)
+
+            if not ids:
+                return None
+
+            self._pending.update(ids)
+            generation = self._generation
+
+        return self._executor.submit(self._load, ids, generation)
+
+    def _load(self, ids, generation):
+        try:
+            rooms = self.load_rooms(ids)
+        except Exception:
+            logging.exception("Prefetch fehlgeschlagen: %s", ids)
+            rooms = {}
+
+        with self._lock:
+            self._pending.difference_update(ids)
+
+            # Zwischendurch hat der Spieler etwas verändert
+            if generation != self._generation:
+                self.discarded += len(rooms)
+                return
+
+            for location_id, room in rooms.items():
+                self._rooms[location_id] = room
+                self._rooms.move_to_end(location_id)
+                self.loaded += 1
+
+            while len(self._rooms) > self.capacity:
+                self._rooms.popitem(last=False)
+                self.evictions += 1
+
+    def take(self, location_id):
+        """
+        entnimmt einen Raum aus dem Cache
+
+        returns:
+            dict: {'items', 'exits'} oder None (Miss)
+        """
+        with self._lock:
+            room = self._rooms.pop(location_id, None)
+            if room is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return room
+
+    def invalidate(self, *location_ids):
+        """
+        verwirft Räume (ohne Angabe alle) und alle laufenden Loads
+
+        args:
+            location_ids (str): Locations, die sich geändert haben
+        """
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            if not location_ids:
+                self._rooms.clear()
+            for location_id in location_ids:
+                self._rooms.pop(location_id, None)
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'loaded': self.loaded,
+                'evictions': self.evictions,
+                'discarded': self.discarded,
+                'size': len(self._rooms),
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
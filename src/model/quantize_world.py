@@ -0,0 +1,74 @@
+"""
+Stellt die Embeddings einer bestehenden Welt auf ein anderes Format um
+(float32, float16, int8 - siehe utils.embedding_quant).
+
+Neo4j: alle Locations, Items und NPCs in einem UNWIND-Write, emb_version
+wird hochgezählt, damit lokale Embedding-Stores neu laden.
+JSON-Welt (memory-Backend): Datei wird umgeschrieben.
+
+Aufruf (aus src/):
+    python -m model.quantize_world int8
+    python -m model.quantize_world float16 --world-file ../data/worlds/world.json
+
+Achtung: Vector Indexes in Neo4j funktionieren nur mit float32.
+"""
+import argparse
+
+from utils.embedding_quant import EMB_FORMATS, EMB_FIELDS, scale_field, quantize_props
+
+
+def quantize_neo4j(fmt):
+    """setzt die Embeddings aller Entities in Neo4j (.env) auf fmt"""
+    from model import queries
+    from model.game_model import GameModel
+
+    model = GameModel()
+    try:
+        rows = []
+        for record in model._run_query(queries.ALL_EMBEDDINGS):
+            props = {key: record[key] for key in record if key not in ('id', 'emb_version')}
+            quantize_props(props, fmt)
+            # Felder ohne Wert auf null -> SET += entfernt alte _scale Properties
+            for field in EMB_FIELDS:
+                props.setdefault(scale_field(field), None)
+            rows.append({'id': record['id'], 'props': props})
+
+        result = model._run_query(queries.SET_EMBEDDINGS, {'rows': rows}, write=True)
+    finally:
+        model.close()
+
+    return result[0]['updated'] if result else 0
+
+
+def quantize_file(path, fmt):
+    """setzt die Embeddings einer JSON-Welt auf fmt"""
+    from model.memory_model import MemoryWorld
+
+    world = MemoryWorld.load(path)
+    updated = 0
+    for node in world.nodes.values():
+        if any(field in node['props'] for field in EMB_FIELDS):
+            quantize_props(node['props'], fmt)
+            node['props']['emb_version'] = node['props'].get('emb_version', 0) + 1
+            updated += 1
+
+    world.dump(path)
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('format', choices=EMB_FORMATS)
+    parser.add_argument('--world-file', help='JSON-Welt statt Neo4j umstellen')
+    args = parser.parse_args()
+
+    if args.world_file:
+        updated = quantize_file(args.world_file, args.format)
+    else:
+        updated = quantize_neo4j(args.format)
+
+    print(f"{updated} Entities auf {args.format} umgestellt")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+"""
+Cypher-Queries des GameModels
+
+Gemeinsam genutzt von GameModel und AsyncGameModel. Die Zustands-Queries
+liefern keine Embeddings, nur emb_version - die Vektoren kommen aus dem
+lokalen EmbeddingStore und werden über EMBEDDINGS nachgeladen.
+
+Alle Spieler-Queries erwarten $player_id (setzt das Model selbst).
+"""
+
+# Spieler im Einzelspieler-Modus, der Server nutzt eigene ids pro Session
+PLAYER_ID = 'player'
+
+# Startpunkt für neue Spieler (GAME_START_LOCATION in .env)
+START_LOCATION = 'marktplatz'
+
+CURRENT_LOCATION = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(location:Location)
+    RETURN
+        location.id AS id,
+        location.name AS name,
+        location.description AS description,
+        coalesce(location.emb_version, 0) AS emb_version
+    """
+
+LOCATION_CONTENT = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(loc:Location)
+    MATCH (item)-[:IST_IN]->(loc)
+    WHERE NOT item:Player
+    RETURN
+        item.id AS id,
+        item.name AS name,
+        item.description AS description,
+        coalesce(item.emb_version, 0) AS emb_version
+    """
+
+LOCATION_EXITS = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(location:Location)
+    MATCH (location)-[:ERREICHT]->(exit:Location)
+    RETURN
+        exit.id AS id,
+        exit.name AS name,
+        exit.description AS description,
+        coalesce(exit.emb_version, 0) AS emb_version
+    """
+
+PLAYER_INVENTORY = """
+    MATCH (p:Player {id: $player_id})-[:TRÄGT]->(inventory:Item)
+    RETURN
+        inventory.id AS id,
+        inventory.name AS name,
+        coalesce(inventory.emb_version, 0) AS emb_version
+    """
+
+ROOM = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(location:Location)
+    RETURN
+        [(item)-[:IST_IN]->(location) WHERE NOT item:Player
+            | item {.id, .name, .description, emb_version: coalesce(item.emb_version, 0)}] AS items,
+        [(location)-[:ERREICHT]->(exit:Location)
+            | exit {.id, .name, .description, emb_version: coalesce(exit.emb_version, 0)}] AS exits
+    """
+
+# Items und Exits mehrerer Locations (Prefetch der Nachbar-Räume)
+ROOMS = """
+    UNWIND $ids AS id
+    MATCH (location:Location {id: id})
+    RETURN
+        location.id AS id,
+        [(item)-[:IST_IN]->(location) WHERE NOT item:Player
+            | item {.id, .name, .description, emb_version: coalesce(item.emb_version, 0)}] AS items,
+        [(location)-[:ERREICHT]->(exit:Location)
+            | exit {.id, .name, .description, emb_version: coalesce(exit.emb_version, 0)}] AS exits
+    """
+
+SNAPSHOT = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(location:Location)
+    RETURN
+        [location {.id, .name, .description, emb_version: coalesce(location.emb_version, 0)}] AS location,
+        [(item)-[:IST_IN]->(location) WHERE NOT item:Player
+            | item {.id, .name, .description, emb_version: coalesce(item.emb_version, 0)}] AS items,
+        [(location)-[:ERREICHT]->(exit:Location)
+            | exit {.id, .name, .description, emb_version: coalesce(exit.emb_version, 0)}] AS exits,
+        [(p)-[:TRÄGT]->(inventory:Item)
+            | inventory {.id, .name, emb_version: coalesce(inventory.emb_version, 0)}] AS inventory
+    """
+
+MOVE_PLAYER = """
+    MATCH (p:Player {id: $player_id})-[old:IST_IN]->(current:Location)
+    MATCH (current)-[:ERREICHT]->(target:Location {id: $to_location})
+    DELETE old
+    CREATE (p)-[:IST_IN]->(target)
+    RETURN
+        target.id AS id,
+        target.name AS name,
+        target.description AS description,
+        coalesce(target.emb_version, 0) AS emb_version
+    """
+
+TAKE_ITEM = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(loc:Location)
+    MATCH (i:Item {id: $item})-[old:IST_IN]->(loc)
+    DELETE old
+    CREATE (p)-[:TRÄGT]->(i)
+    RETURN
+        i.id AS id,
+        i.name AS name,
+        i.description AS description,
+        coalesce(i.emb_version, 0) AS emb_version
+    """
+
+DROP_ITEM = """
+    MATCH (p:Player {id: $player_id})-[old:TRÄGT]->(i:Item {id: $item})
+    MATCH (p)-[:IST_IN]->(loc:Location)
+    DELETE old
+    CREATE (i)-[:IST_IN]->(loc)
+    RETURN
+        i.id AS id,
+        i.name AS name,
+        i.description AS description,
+        coalesce(i.emb_version, 0) AS emb_version
+    """
+
+# Generation der Welt: der World-Node verschwindet mit jedem Reset (DETACH DELETE
+# aller Nodes), der nächste Start legt ihn mit einer neuen Generation an
+WORLD_GENERATION = """
+    MERGE (w:World {id: 'world'})
+    ON CREATE SET w.generation = randomUUID()
+    RETURN w.generation AS generation
+    """
+
+# Neue Generation nach dem Neuanlegen einer Welt (world_loader --reset)
+NEW_WORLD_GENERATION = """
+    MERGE (w:World {id: 'world'})
+    SET w.generation = randomUUID()
+    RETURN w.generation AS generation
+    """
+
+# Legt den Spieler an (falls neu) und stellt ihn auf $start, falls er nirgends steht
+ENSURE_PLAYER = """
+    MERGE (p:Player {id: $player_id})
+    ON CREATE SET p.name = $player_id
+    WITH p
+    OPTIONAL MATCH (p)-[:IST_IN]->(current:Location)
+    WITH p, current
+    WHERE current IS NULL
+    MATCH (start:Location {id: $start})
+    CREATE (p)-[:IST_IN]->(start)
+    RETURN start.id AS id
+    """
+
+# Embeddings inkl. Skalierung (int8, siehe utils.embedding_quant)
+_EMBEDDING_COLUMNS = """
+        coalesce(n.emb_version, 0) AS emb_version,
+        n.name_emb AS name_emb, n.name_emb_scale AS name_emb_scale,
+        n.synonyms_emb AS synonyms_emb, n.synonyms_emb_scale AS synonyms_emb_scale,
+        n.description_emb AS description_emb, n.description_emb_scale AS description_emb_scale
+    """
+
+EMBEDDINGS = f"""
+    UNWIND $ids AS id
+    OPTIONAL MATCH (l:Location {{id: id}})
+    OPTIONAL MATCH (i:Item {{id: id}})
+    OPTIONAL MATCH (npc:NPC {{id: id}})
+    WITH id, coalesce(l, i, npc) AS n
+    WHERE n IS NOT NULL
+    RETURN id, {_EMBEDDING_COLUMNS}
+    """
+
+ALL_EMBEDDINGS = f"""
+    MATCH (n:Location)
+    RETURN n.id AS id, {_EMBEDDING_COLUMNS}
+    UNION ALL
+    MATCH (n:Item)
+    RETURN n.id AS id, {_EMBEDDING_COLUMNS}
+    UNION ALL
+    MATCH (n:NPC)
+    RETURN n.id AS id, {_EMBEDDING_COLUMNS}
+    """
+
+# row: {id, props} - props mit null entfernt die Property (alte _scale Felder)
+SET_EMBEDDINGS = """
+    UNWIND $rows AS row
+    OPTIONAL MATCH (l:Location {id: row.id})
+    OPTIONAL MATCH (i:Item {id: row.id})
+    OPTIONAL MATCH (npc:NPC {id: row.id})
+    WITH row, coalesce(l, i, npc) AS n
+    WHERE n IS NOT NULL
+    SET n += row.props, n.emb_version = coalesce(n.emb_version, 0) + 1
+    RETURN count(n) AS updated
+    """
+
+# Spielstand (model/savegame.py): Player, Platzierungen und Flags, keine Embeddings
+SAVE_PLAYERS = """
+    MATCH (p:Player)
+    RETURN p.id AS id, p.name AS name
+    """
+
+SAVE_EDGES = """
+    MATCH (a)-[r:IST_IN|TRÄGT]->(b)
+    RETURN a.id AS from, type(r) AS type, b.id AS to
+    """
+
+SAVE_FLAGS = """
+    MATCH (n:Item|Location)
+    WHERE n.is_lit IS NOT NULL OR n.is_locked IS NOT NULL
+    RETURN n.id AS id, n.is_lit AS is_lit, n.is_locked AS is_locked
+    """
+
+# Restore: die RESTORE_* Queries laufen in dieser Reihenfolge in einer Transaktion
+RESTORE_CLEAR_EDGES = """
+    MATCH ()-[r:IST_IN|TRÄGT]->()
+    DELETE r
+    """
+
+RESTORE_PLAYERS = """
+    UNWIND $players AS player
+    MERGE (p:Player {id: player.id})
+    ON CREATE SET p.name = player.name
+    """
+
+RESTORE_LOCATED = """
+    UNWIND $rows AS row
+    MATCH (location:Location {id: row.to})
+    OPTIONAL MATCH (i:Item {id: row.from})
+    OPTIONAL MATCH (npc:NPC {id: row.from})
+    OPTIONAL MATCH (p:Player {id: row.from})
+    WITH location, coalesce(i, npc, p) AS n
+    WHERE n IS NOT NULL
+    CREATE (n)-[:IST_IN]->(location)
+    """
+
+RESTORE_CARRIED = """
+    UNWIND $rows AS row
+    MATCH (item:Item {id: row.to})
+    OPTIONAL MATCH (p:Player {id: row.from})
+    OPTIONAL MATCH (npc:NPC {id: row.from})
+    WITH item, coalesce(p, npc) AS holder
+    WHERE holder IS NOT NULL
+    CREATE (holder)-[:TRÄGT]->(item)
+    """
+
+RESTORE_CLEAR_FLAGS = """
+    MATCH (n:Item|Location)
+    WHERE n.is_lit IS NOT NULL OR n.is_locked IS NOT NULL
+    SET n.is_lit = null, n.is_locked = null
+    """
+
+RESTORE_FLAGS = """
+    UNWIND $rows AS row
+    OPTIONAL MATCH (i:Item {id: row.id})
+    OPTIONAL MATCH (l:Location {id: row.id})
+    WITH row, coalesce(i, l) AS n
+    WHERE n IS NOT NULL
+    SET n += row.props
+    """
+
+# Schema: ids eindeutig und indiziert, damit alle {id: ...} Lookups Index-Seeks sind.
+# Namen wie im Setup-Notebook, IF NOT EXISTS macht das Anlegen idempotent.
+SCHEMA = [
+    'CREATE CONSTRAINT player_id IF NOT EXISTS FOR (p:Player) REQUIRE p.id IS UNIQUE',
+    'CREATE CONSTRAINT location_id IF NOT EXISTS FOR (l:Location) REQUIRE l.id IS UNIQUE',
+    'CREATE CONSTRAINT item_id IF NOT EXISTS FOR (i:Item) REQUIRE i.id IS UNIQUE',
+    'CREATE CONSTRAINT npc_id IF NOT EXISTS FOR (n:NPC) REQUIRE n.id IS UNIQUE',
+    'CREATE CONSTRAINT world_id IF NOT EXISTS FOR (w:World) REQUIRE w.id IS UNIQUE',
+]
@@ -0,0 +1,167 @@
+"""
+Spielstände: der veränderliche Teil der Welt als kompakte Binärdatei.
+
+Gespeichert werden nur Player-Nodes, alle IST_IN und TRÄGT Relationships
+und die Flags is_lit/is_locked - keine Texte, keine Embeddings. Restore
+ersetzt genau diese Teile in einer Transaktion (Neo4j) bzw. unter dem
+Welt-Lock (memory-Backend), Embeddings und emb_version bleiben unberührt.
+
+Format: MAGIC, Version, dann zlib-komprimiert eine String-Tabelle (jede id
+einmal) und Indizes darauf (little endian).
+
+Aufruf (aus src/, Backend aus GAME_BACKEND):
+    python -m model.savegame save ../saves/start.rvsave
+    python -m model.savegame restore ../saves/start.rvsave
+"""
+import zlib
+import time
+import struct
+import argparse
+from pathlib import Path
+from dataclasses import dataclass, field
+
+MAGIC = b'RVSG'
+VERSION = 1
+
+# Relationships, die den Spielstand ausmachen
+STATE_RELATIONSHIPS = ('IST_IN', 'TRÄGT')
+
+# Properties, die sich im Spiel ändern (Fackel anzünden, Truhe öffnen)
+STATE_FLAGS = ('is_lit', 'is_locked')
+
+# Index für "kein String" (Player ohne Namen)
+NO_STRING = 0xFFFFFFFF
+
+
+@dataclass
+class GameSnapshot:
+    """veränderlicher Spielstand, unabhängig vom Backend"""
+    players: list = field(default_factory=list)  # [(id, name)]
+    edges: list = field(default_factory=list)    # [(from_id, rel_type, to_id)] aus STATE_RELATIONSHIPS
+    flags: list = field(default_factory=list)    # [(node_id, prop, bool)] aus STATE_FLAGS, nur gesetzte Werte
+
+    def to_bytes(self):
+        strings = {}
+
+        def ref(value):
+            return NO_STRING if value is None else strings.setdefault(value, len(strings))
+
+        players = [index for player_id, name in self.players for index in (ref(player_id), ref(name))]
+        edges = [ref(from_id) for from_id, _, _ in self.edges], [ref(to_id) for _, _, to_id in self.edges]
+        edge_types = bytes(STATE_RELATIONSHIPS.index(rel_type) for _, rel_type, _ in self.edges)
+        flag_nodes = [ref(node_id) for node_id, _, _ in self.flags]
+        flag_values = bytes(STATE_FLAGS.index(prop) << 1 | bool(value) for _, prop, value in self.flags)
+
+        encoded = [value.encode('utf-8') for value in strings]
+        body = b''.join([
+            struct.pack('<I', len(encoded)),
+            b''.join(struct.pack('<H', len(value)) + value for value in encoded),
+            struct.pack(f'<I{len(players)}I', len(self.players), *players),
+            struct.pack(f'<I{len(self.edges)}I{len(self.edges)}I', len(self.edges), *edges[0], *edges[1]),
+            edge_types,
+            struct.pack(f'<I{len(flag_nodes)}I', len(self.flags), *flag_nodes),
+            flag_values,
+        ])
+        return MAGIC + struct.pack('<B', VERSION) + zlib.compress(body)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Kein Spielstand (falsche Kennung)")
+        version = data[len(MAGIC)]
+        if version != VERSION:
+            raise ValueError(f"Spielstand-Version {version} wird nicht unterstützt (erwartet {VERSION})")
+
+        body = zlib.decompress(data[len(MAGIC) + 1:])
+        offset = 0
+
+        def read(fmt):
+            nonlocal offset
+            values = struct.unpack_from(fmt, body, offset)
+            offset += struct.calcsize(fmt)
+            return values
+
+        def read_bytes(length):
+            nonlocal offset
+            offset += length
+            return body[offset - length:offset]
+
+        strings = []
+        for _ in range(read('<I')[0]):
+            strings.append(read_bytes(read('<H')[0]).decode('utf-8'))
+
+        def text(index):
+            return None if index == NO_STRING else strings[index]
+
+        count = read('<I')[0]
+        refs = read(f'<{2 * count}I')
+        players = [(text(refs[i]), text(refs[i + 1])) for i in range(0, len(refs), 2)]
+
+        count = read('<I')[0]
+        froms, tos = read(f'<{count}I'), read(f'<{count}I')
+        types = read_bytes(count)
+        edges = [(strings[f], STATE_RELATIONSHIPS[t], strings[to]) for f, t, to in zip(froms, types, tos)]
+
+        count = read('<I')[0]
+        nodes = read(f'<{count}I')
+        values = read_bytes(count)
+        flags = [(strings[node], STATE_FLAGS[value >> 1], bool(value & 1)) for node, value in zip(nodes, values)]
+
+        return cls(players=players, edges=edges, flags=flags)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def rows(self):
+        """Parameter für die Restore-Queries in model.queries"""
+        flags = {}
+        for node_id, prop, value in self.flags:
+            flags.setdefault(node_id, {})[prop] = value
+
+        return {
+            'players': [{'id': player_id, 'name': name} for player_id, name in self.players],
+            'located': [{'from': f, 'to': to} for f, rel_type, to in self.edges if rel_type == 'IST_IN'],
+            'carried': [{'from': f, 'to': to} for f, rel_type, to in self.edges if rel_type == 'TRÄGT'],
+            'flags': [{'id': node_id, 'props': props} for node_id, props in flags.items()],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('action', choices=('save', 'restore'))
+    parser.add_argument('path', help='Spielstand-Datei')
+    args = parser.parse_args()
+
+    from model.factory import create_model
+
+    model = create_model()
+    try:
+        start = time.perf_counter()
+        if args.action == 'save':
+            snapshot = model.save_state()
+            snapshot.save(args.path)
+        else:
+            snapshot = GameSnapshot.load(args.path)
+            model.restore_state(snapshot)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        model.close()
+
+    # memory-Backend: Spielstand liegt nur im Speicher, also Welt-Datei mitschreiben
+    if args.action == 'restore' and hasattr(model, 'dump'):
+        model.dump()
+
+    print(
+        f"{args.action}: {len(snapshot.players)} Player, {len(snapshot.edges)} Relationships, "
+        f"{len(snapshot.flags)} Flags in {elapsed:.1f}ms ({Path(args.path).stat().st_size} Bytes)"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Schema der Spielwelt in Neo4j: Constraints anlegen und Query-Pläne prüfen.
+
+bootstrap() legt die Uniqueness-Constraints für Player, Location, Item,
+NPC und World ids an (idempotent, läuft beim Start des GameModels bzw. in
+AsyncGameModel.start über bootstrap_async). check_plans()
+lässt jede Model-Query per EXPLAIN planen und meldet Queries, deren Plan
+auf einen Scan zurückfällt (AllNodesScan, NodeByLabelScan, ...).
+
+Aufruf (aus src/):
+    python -m model.schema            # Constraints anlegen
+    python -m model.schema --check    # zusätzlich Pläne prüfen, Exit 1 bei Scan
+"""
+import sys
+import argparse
+import functools
+
+from model import queries
+from model.connection import session_config
+
+# Queries, die planmäßig alle Nodes eines Labels (bzw. alle Relationships eines Types) lesen
+SCAN_ALLOWED = {'ALL_EMBEDDINGS', 'SAVE_PLAYERS', 'SAVE_EDGES', 'SAVE_FLAGS', 'RESTORE_CLEAR_EDGES', 'RESTORE_CLEAR_FLAGS'}
+
+# Beispiel-Parameter für EXPLAIN (die Werte spielen für den Plan keine Rolle)
+EXPLAIN_PARAMS = {
+    'to_location': 'marktplatz',
+    'item': 'fackel',
+    'start': queries.START_LOCATION,
+    'ids': ['fackel'],
+    'rows': [{'id': 'fackel', 'from': 'fackel', 'to': 'marktplatz', 'props': {}}],
+    'players': [{'id': 'player', 'name': 'Player'}],
+}
+
+
+def model_queries():
+    """alle Cypher-Queries aus model.queries (Name -> Query), ohne Schema"""
+    return {
+        name: value for name, value in vars(queries).items()
+        if name.isupper() and isinstance(value, str) and not name.startswith('_')
+        and value.lstrip().upper().startswith(('MATCH', 'OPTIONAL', 'UNWIND', 'MERGE', 'CREATE', 'WITH'))
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _query_names():
+    return {query: name for name, query in model_queries().items()}
+
+
+def query_name(query):
+    """Name einer Query aus model.queries (für Tracing), sonst 'query'"""
+    return _query_names().get(query, 'query')
+
+
+def bootstrap(driver):
+    """legt Constraints (und damit die id-Indexes) an, falls sie fehlen"""
+    with driver.session(**session_config()) as session:
+        for statement in queries.SCHEMA:
+            session.run(statement).consume()
+
+
+async def bootstrap_async(driver):
+    """wie bootstrap(), für den AsyncDriver (AsyncGameModel.start)"""
+    async with driver.session(**session_config()) as session:
+        for statement in queries.SCHEMA:
+            result = await session.run(statement)
+            await result.consume()
+
+
+def _operators(plan):
+    """alle Operatoren eines Plans (Baum aus dicts), ohne @neo4j Suffix"""
+    yield plan['operatorType'].split('@')[0]
+    for child in plan.get('children', []):
+        yield from _operators(child)
+
+
+def check_plans(driver, player_id=queries.PLAYER_ID):
+    """
+    plant jede Model-Query per EXPLAIN (führt nichts aus)
+
+    returns:
+        dict: Query-Name -> Liste der Scan-Operatoren (nur Queries mit Scan)
+    """
+    params = {'player_id': player_id, **EXPLAIN_PARAMS}
+    failures = {}
+
+    with driver.session(**session_config()) as session:
+        for name, query in model_queries().items():
+            if name in SCAN_ALLOWED:
+                continue
+            plan = session.run(f'EXPLAIN {query}', params).consume().plan
+            scans = [operator for operator in _operators(plan) if 'Scan' in operator]
+            if scans:
+                failures[name] = scans
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check', action='store_true', help='Query-Pläne auf Scans prüfen')
+    args = parser.parse_args()
+
+    from model.game_model import GameModel
+
+    # GameModel legt die Constraints beim Start selbst an
+    model = GameModel(cache=False)
+    try:
+        print(f"{len(queries.SCHEMA)} Constraints vorhanden")
+
+        if not args.check:
+            return
+
+        failures = check_plans(model.driver)
+        for name in model_queries():
+            if name in SCAN_ALLOWED:
+                status = 'übersprungen'
+            elif name in failures:
+                status = 'SCAN: ' + ', '.join(failures[name])
+            else:
+                status = 'ok'
+            print(f"  {name:20} {status}")
+    finally:
+        model.close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
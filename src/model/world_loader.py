@@ -0,0 +1,384 @@
+"""
+Lädt eine Spielwelt aus einer Definitionsdatei (JSON) statt über das
+Setup-Notebook.
+
+Die Datei enthält locations, items, npcs, players und relationships (siehe
+docs/world_schema.md und data/definitions/ragventure.json). Alle Texte
+werden in großen encode-Batches eingebettet, doppelte Texte nur einmal.
+Geschrieben wird mit UNWIND-Batches: ein Query pro Label bzw.
+Relationship-Type, mehrere Batches pro Transaktion. Relationship-Types und
+die Labels an beiden Enden werden vor dem ersten Write geprüft.
+
+Ein erneuter Lauf ohne --reset aktualisiert die Welt: Nodes per MERGE,
+emb_version wird hochgezählt, die Platzierung (IST_IN/TRÄGT) der Nodes aus
+der Definition ersetzt die bisherige. Nach --reset bekommt die Welt eine
+neue Generation, lokale Embedding-Stores werden dann verworfen.
+
+Aufruf (aus src/):
+    python -m model.world_loader ../data/definitions/ragventure.json --reset
+    python -m model.world_loader welt.json --check        # nur prüfen
+    python -m model.world_loader welt.json --world-file ../data/worlds/world.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+from utils.embedding_quant import EMB_FORMATS, quantize_props
+
+# Abschnitt der Definitionsdatei -> Label
+SECTIONS = {
+    'locations': 'Location',
+    'items': 'Item',
+    'npcs': 'NPC',
+    'players': 'Player',
+}
+
+REQUIRED_PROPS = ('id', 'name', 'description')
+
+# Defaults wie die create_* Helper im Setup-Notebook
+DEFAULT_PROPS = {
+    'Location': {
+        'is_dark': False,
+        'requires_light': False,
+        'is_locked': False,
+    },
+    'Item': {
+        'is_takeable': True,
+        'is_usable': False,
+        'is_readable': False,
+        'is_container': False,
+        'is_locked': None,
+        'is_lit': None,
+        'is_light_source': False,
+        'item_type': None,
+        'weight': None,
+    },
+    'NPC': {
+        'dialogue': None,
+        'is_trader': False,
+        'is_quest_giver': False,
+    },
+    'Player': {},
+}
+
+# Relationship-Type -> (erlaubte Labels am Start, erlaubte Labels am Ziel)
+RELATIONSHIP_TYPES = {
+    'IST_IN': ({'Item', 'NPC', 'Player'}, {'Location'}),
+    'TRÄGT': ({'Player', 'NPC'}, {'Item'}),
+    'ERREICHT': ({'Location'}, {'Location'}),
+    'ÖFFNET': ({'Item'}, {'Item', 'Location'}),
+    'KANN_ANZÜNDEN': ({'Item'}, {'Item'}),
+    'BELEUCHTET': ({'Item'}, {'Location'}),
+    'KANN_BRECHEN': ({'Item'}, {'Item'}),
+}
+
+# werden in beide Richtungen angelegt (connect_locations im Notebook)
+BIDIRECTIONAL = {'ERREICHT'}
+
+# Relationships, die einen Node platzieren, und welches Ende der platzierte Node ist:
+# jeder Node steht an höchstens einem Ort oder wird von höchstens einem getragen
+PLACEMENT = {'IST_IN': 'from', 'TRÄGT': 'to'}
+
+# Players bekommen keine Embeddings (wie create_player im Notebook)
+EMBEDDED_LABELS = {'Location', 'Item', 'NPC'}
+
+# Labels und Types kommen nur aus den Whitelists oben, Werte immer als Parameter
+NODE_QUERY = """
+    UNWIND $rows AS row
+    MERGE (n:{label} {{id: row.id}})
+    SET n += row.props, n.emb_version = coalesce(n.emb_version, 0) + 1
+    """
+
+PLAYER_QUERY = """
+    UNWIND $rows AS row
+    MERGE (n:Player {id: row.id})
+    SET n += row.props
+    """
+
+RELATIONSHIP_QUERY = """
+    UNWIND $rows AS row
+    MATCH (a:{from_label} {{id: row.from}})
+    MATCH (b:{to_label} {{id: row.to}})
+    MERGE (a)-[:`{rel_type}`]->(b)
+    """
+
+# Vor einem erneuten Lauf: bisherige Platzierung (IST_IN/TRÄGT) der Nodes, die die
+# Definition platziert, entfernen - sonst steht ein Node danach an zwei Orten
+CLEAR_PLACEMENT_QUERY = """
+    UNWIND $rows AS row
+    MATCH (n:{label} {{id: row.id}})
+    CALL {{ WITH n MATCH (n)-[r:IST_IN]->() DELETE r }}
+    CALL {{ WITH n MATCH ()-[r:TRÄGT]->(n) DELETE r }}
+    """
+
+RESET_QUERY = """
+    MATCH (n)
+    CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
+    """
+
+# Zeilen pro UNWIND und UNWIND-Batches pro Transaktion
+BATCH_SIZE = 1000
+BATCHES_PER_TRANSACTION = 10
+
+# Texte pro encode-Aufruf
+ENCODE_BATCH_SIZE = 256
+
+
+def load_definition(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_nodes(definition):
+    """
+    Nodes aus der Definition, mit Defaults und kleingeschriebenen ids
+
+    returns:
+        list: [{'label', 'props', 'synonyms'}]
+    """
+    nodes = []
+    for section, label in SECTIONS.items():
+        for entry in definition.get(section, []):
+            props = {**DEFAULT_PROPS[label], **entry}
+            synonyms = props.pop('synonyms', None)
+            if isinstance(props.get('id'), str):
+                props['id'] = props['id'].lower()
+            nodes.append({'label': label, 'props': props, 'synonyms': synonyms})
+    return nodes
+
+
+def validate(nodes, relationships):
+    """
+    prüft Nodes und Relationships gegen das Schema
+
+    returns:
+        list: Relationships als (from, type, to), ERREICHT in beide Richtungen,
+        ohne Duplikate
+
+    raises:
+        ValueError: mit allen gefundenen Fehlern
+    """
+    errors = []
+    labels = {}
+
+    for node in nodes:
+        props = node['props']
+        missing = [key for key in REQUIRED_PROPS if not props.get(key)]
+        if missing:
+            errors.append(f"{node['label']} {props.get('id')!r}: {', '.join(missing)} fehlt")
+            continue
+        if props['id'] in labels:
+            errors.append(f"id {props['id']!r} doppelt ({labels[props['id']]} und {node['label']})")
+            continue
+        labels[props['id']] = node['label']
+
+    edges = {}
+    placed = {}
+    for index, rel in enumerate(relationships):
+        from_id, rel_type, to_id = str(rel.get('from', '')).lower(), rel.get('type'), str(rel.get('to', '')).lower()
+        where = f"relationships[{index}] {from_id}-[:{rel_type}]->{to_id}"
+
+        if rel_type not in RELATIONSHIP_TYPES:
+            errors.append(f"{where}: unbekannter Type, erlaubt: {', '.join(RELATIONSHIP_TYPES)}")
+            continue
+
+        unknown = [node_id for node_id in (from_id, to_id) if node_id not in labels]
+        if unknown:
+            errors.append(f"{where}: Node {', '.join(unknown)} fehlt")
+            continue
+
+        from_labels, to_labels = RELATIONSHIP_TYPES[rel_type]
+        if labels[from_id] not in from_labels or labels[to_id] not in to_labels:
+            errors.append(f"{where}: {labels[from_id]} -> {labels[to_id]} nicht erlaubt")
+            continue
+
+        if rel_type in PLACEMENT:
+            node_id, other_id = (from_id, to_id) if PLACEMENT[rel_type] == 'from' else (to_id, from_id)
+            previous = placed.setdefault(node_id, (rel_type, other_id))
+            if previous != (rel_type, other_id):
+                errors.append(f"{where}: {node_id} ist schon platziert ({previous[0]} {previous[1]})")
+                continue
+
+        edges[(from_id, rel_type, to_id)] = None
+        if rel_type in BIDIRECTIONAL:
+            edges[(to_id, rel_type, from_id)] = None
+
+    if errors:
+        raise ValueError(f"{len(errors)} Fehler in der Weltdefinition:\n  " + '\n  '.join(errors))
+
+    return list(edges)
+
+
+def embed_nodes(nodes, encoder, fmt='float32', batch_size=ENCODE_BATCH_SIZE):
+    """
+    berechnet name_emb, description_emb und synonyms_emb aller Nodes
+
+    Jeder Text wird einmal eingebettet (viele Items teilen z.B. Synonyme),
+    alle Texte in einem encode-Aufruf mit großen Batches.
+
+    returns:
+        int: Anzahl eingebetteter Texte
+    """
+    texts = {}
+    jobs = []
+    for node in nodes:
+        if node['label'] not in EMBEDDED_LABELS:
+            continue
+        props = node['props']
+        fields = {'name_emb': props['name'], 'description_emb': props['description']}
+        # Synonyme wie im Notebook als ein Text
+        if node['synonyms']:
+            fields['synonyms_emb'] = ' '.join(node['synonyms'])
+        for field, text in fields.items():
+            jobs.append((props, field, texts.setdefault(text, len(texts))))
+
+    if not texts:
+        return 0
+
+    vectors = encoder.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+
+    for props, field, index in jobs:
+        props[field] = vectors[index]
+    for node in nodes:
+        if node['label'] in EMBEDDED_LABELS:
+            quantize_props(node['props'], fmt)
+
+    return len(texts)
+
+
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def write_neo4j(session, query, rows, batch_size=BATCH_SIZE, batches_per_transaction=BATCHES_PER_TRANSACTION):
+    """
+    schreibt rows per UNWIND, mehrere Batches in einer Transaktion
+
+    returns:
+        int: Anzahl Transaktionen
+    """
+    def work(tx, batches):
+        for batch in batches:
+            tx.run(query, rows=batch).consume()
+
+    transactions = 0
+    batches = list(_chunks(rows, batch_size))
+    for group in _chunks(batches, batches_per_transaction):
+        session.execute_write(work, group)
+        transactions += 1
+    return transactions
+
+
+def load_neo4j(nodes, edges, reset=False, batch_size=BATCH_SIZE):
+    """schreibt die Welt in Neo4j (.env), legt vorher die id-Constraints an"""
+    from model import queries
+    from model.game_model import GameModel
+    from model.connection import session_config
+
+    model = GameModel(cache=False)
+    transactions = 0
+    try:
+        with model.driver.session(**session_config()) as session:
+            if reset:
+                session.run(RESET_QUERY).consume()
+
+            for label in SECTIONS.values():
+                rows = [{'id': node['props']['id'], 'props': node['props']} for node in nodes if node['label'] == label]
+                if rows:
+                    query = PLAYER_QUERY if label == 'Player' else NODE_QUERY.format(label=label)
+                    transactions += write_neo4j(session, query, rows, batch_size)
+
+            label_of = {node['props']['id']: node['label'] for node in nodes}
+
+            # Platzierung aus der Definition ersetzt die bisherige (Spielstand, verschobene Items)
+            if not reset:
+                placed = {}
+                for from_id, rel_type, to_id in edges:
+                    if rel_type in PLACEMENT:
+                        node_id = from_id if PLACEMENT[rel_type] == 'from' else to_id
+                        placed.setdefault(label_of[node_id], {})[node_id] = None
+                for label, ids in placed.items():
+                    query = CLEAR_PLACEMENT_QUERY.format(label=label)
+                    transactions += write_neo4j(session, query, [{'id': node_id} for node_id in ids], batch_size)
+
+            groups = {}
+            for from_id, rel_type, to_id in edges:
+                groups.setdefault((rel_type, label_of[from_id], label_of[to_id]), []).append({'from': from_id, 'to': to_id})
+
+            for (rel_type, from_label, to_label), rows in groups.items():
+                query = RELATIONSHIP_QUERY.format(rel_type=rel_type, from_label=from_label, to_label=to_label)
+                transactions += write_neo4j(session, query, rows, batch_size)
+
+            # emb_version fängt nach dem Reset wieder bei 1 an: neue Generation,
+            # damit kein lokaler Embedding-Store die alten Vektoren weiter nutzt
+            if reset:
+                session.run(queries.NEW_WORLD_GENERATION).consume()
+                transactions += 1
+    finally:
+        model.close()
+
+    return transactions
+
+
+def load_file(nodes, edges, path):
+    """schreibt die Welt als JSON für das memory-Backend"""
+    from model.memory_model import MemoryWorld
+
+    world = MemoryWorld()
+    for node in nodes:
+        world.nodes[node['props']['id']] = {'labels': {node['label']}, 'props': node['props']}
+    for from_id, rel_type, to_id in edges:
+        world.add_relationship(from_id, rel_type, to_id)
+
+    world.dump(path)
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('definition', help='Weltdefinition (JSON)')
+    parser.add_argument('--check', action='store_true', help='nur prüfen, nichts einbetten oder schreiben')
+    parser.add_argument('--reset', action='store_true', help='vorher ALLE Nodes in Neo4j löschen')
+    parser.add_argument('--world-file', help='als JSON-Welt (memory-Backend) statt nach Neo4j schreiben')
+    parser.add_argument('--format', choices=EMB_FORMATS, default=os.getenv('EMBEDDING_FORMAT', 'float32'),
+                        help='Speicherformat der Embeddings (default: EMBEDDING_FORMAT)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Zeilen pro UNWIND')
+    parser.add_argument('--encode-batch-size', type=int, default=ENCODE_BATCH_SIZE, help='Texte pro encode-Batch')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    definition = load_definition(args.definition)
+    nodes = build_nodes(definition)
+    try:
+        edges = validate(nodes, definition.get('relationships', []))
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    print(f"{len(nodes)} Nodes, {len(edges)} Relationships geprüft")
+    if args.check:
+        return
+
+    from utils.embedding_utils import MODEL_NAME
+    from utils.embedding_backend import load_encoder
+
+    encoded = embed_nodes(nodes, load_encoder(MODEL_NAME), args.format, args.encode_batch_size)
+    embedded = time.perf_counter()
+    print(f"{encoded} Texte eingebettet ({args.format}) in {embedded - start:.1f}s")
+
+    if args.world_file:
+        load_file(nodes, edges, args.world_file)
+        print(f"Welt geschrieben: {args.world_file}")
+    else:
+        transactions = load_neo4j(nodes, edges, reset=args.reset, batch_size=args.batch_size)
+        print(f"In Neo4j geschrieben: {transactions} Transaktionen in {time.perf_counter() - embedded:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Headless Replay: spielt ein Transcript ohne Rich-Oberfläche durch und
+meldet Zeiten pro Befehl und den Endzustand.
+
+Aufruf (aus src/):
+    python replay.py ../data/transcripts/rundgang.txt --json replay.json
+    python replay.py ../data/transcripts/rundgang.txt --trace trace.json   # Zeiten pro Stufe
+"""
+import sys
+import json
+import argparse
+
+from view.null_view import NullView
+from controller.game_controller import GameController
+from controller.replay import load_transcript, replay
+from utils import tracing
+from utils.log_setup import configure_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('transcript', help='Datei mit einem Befehl pro Zeile')
+    parser.add_argument('--json', help='Ergebnis zusätzlich als JSON speichern')
+    parser.add_argument('--trace', help='Spans pro Stufe messen und als Chrome-Trace speichern')
+    args = parser.parse_args()
+
+    # Logging vor dem Tracing: dessen atexit-dump() muss vor dem Stoppen des Log-Listeners laufen
+    configure_logging()
+    if args.trace:
+        tracing.enable(trace_file=args.trace)
+
+    controller = GameController(view=NullView())
+    try:
+        report = replay(controller, load_transcript(args.transcript))
+    finally:
+        controller.model.close()
+
+    for turn in report['turns']:
+        mark = 'ok  ' if turn['ok'] else 'FAIL'
+        print(f"{mark} {turn['total_ms']:8.1f}ms  {turn['command']:30} -> {turn['status']}")
+        if not turn['ok']:
+            print(f"{'':19}erwartet: {turn['expected']}")
+
+    total = report['summary']['total']
+    print(f"\n{total['n']} Befehle, p50={total['p50_ms']:.1f}ms p95={total['p95_ms']:.1f}ms max={total['max_ms']:.1f}ms")
+    print(f"Endzustand: {json.dumps(report['final_state'], ensure_ascii=False)}")
+
+    if report['stages']:
+        print("\nStufen:")
+        for name, stats in report['stages'].items():
+            print(f"  {name:24} n={stats['n']:4} p50={stats['p50_ms']:7.1f}ms p95={stats['p95_ms']:7.1f}ms max={stats['max_ms']:7.1f}ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if report['failures'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Mehrspieler-Server: viele Spieler in einem Prozess, Parser und Modelle
+werden nur einmal geladen. Jede Verbindung spielt mit eigenem Player-Node.
+
+Aufruf (aus src/):
+    python server.py --port 4000
+
+Verbinden z.B. mit:
+    nc localhost 4000
+"""
+import os
+import asyncio
+import argparse
+
+from dotenv import load_dotenv
+
+from controller.game_server import GameServer
+from utils.log_setup import configure_logging
+from utils.tracing import configure_tracing
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=os.getenv('SERVER_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('SERVER_PORT', '4000')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SERVER_WORKERS', '8')),
+                        help='Threads für Parser und DB-Zugriffe')
+    args = parser.parse_args()
+
+    configure_logging('server.log')
+    configure_tracing()
+
+    server = GameServer(workers=args.workers)
+    print(f"RagVenture-Server auf {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
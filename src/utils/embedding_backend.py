@@ -0,0 +1,78 @@
+"""
+Inferenz-Backends für das Sentence-Transformer Modell.
+
+    torch      PyTorch (Default)
+    onnx       ONNX Runtime, Export beim ersten Start
+    onnx-int8  ONNX Runtime, dynamisch int8-quantisiert (CPU)
+
+Alle liefern ein SentenceTransformer-Objekt, encode() bleibt gleich. Die
+ONNX-Varianten brauchen sentence-transformers >= 3.2 (backend='onnx',
+export_dynamic_quantized_onnx_model): pip install "sentence-transformers[onnx]>=3.2.0"
+"""
+import os
+import logging
+
+from dotenv import load_dotenv
+from sentence_transformers import SentenceTransformer
+
+from utils.embedding_cache import cache_dir
+
+EMBEDDING_BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+# Befehlssatz für die int8-Kernels (avx2 läuft auf praktisch jeder x86 CPU)
+QUANTIZATION_CONFIG = 'avx2'
+
+
+def embedding_backend():
+    """gewähltes Backend (EMBEDDING_BACKEND aus .env, default: torch)"""
+    load_dotenv()
+    backend = os.getenv('EMBEDDING_BACKEND') or 'torch'
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unbekanntes EMBEDDING_BACKEND '{backend}', erlaubt: {EMBEDDING_BACKENDS}")
+    return backend
+
+
+def load_encoder(model_name, backend=None):
+    """
+    lädt das Modell mit dem gewünschten Backend
+
+    args:
+        model_name (str): Sentence-Transformer Modell
+        backend (str): eines von EMBEDDING_BACKENDS (default: EMBEDDING_BACKEND)
+
+    returns:
+        SentenceTransformer
+    """
+    backend = backend or embedding_backend()
+
+    if backend == 'torch':
+        return SentenceTransformer(model_name)
+
+    try:
+        if backend == 'onnx':
+            return SentenceTransformer(model_name, backend='onnx')
+        return _load_quantized(model_name)
+    except ImportError as e:
+        raise ImportError(
+            f"EMBEDDING_BACKEND={backend} braucht ONNX Runtime und sentence-transformers >= 3.2: "
+            f"pip install \"sentence-transformers[onnx]>=3.2.0\""
+        ) from e
+
+
+def _load_quantized(model_name):
+    """
+    int8-Modell aus dem Cache, beim ersten Start wird es aus dem ONNX-Export
+    erzeugt und unter <cache_dir>/onnx_<modell> gespeichert
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    directory = cache_dir() / f"onnx_{model_name.replace('/', '_')}"
+    file_name = f'onnx/model_qint8_{QUANTIZATION_CONFIG}.onnx'
+
+    if not (directory / file_name).exists():
+        logging.info(f"Quantisiere {model_name} nach {directory} ({QUANTIZATION_CONFIG})")
+        model = SentenceTransformer(model_name, backend='onnx')
+        model.save_pretrained(str(directory))
+        export_dynamic_quantized_onnx_model(model, QUANTIZATION_CONFIG, str(directory))
+
+    return SentenceTransformer(str(directory), backend='onnx', model_kwargs={'file_name': file_name})
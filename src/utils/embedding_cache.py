@@ -0,0 +1,87 @@
+import os
+import json
+import contextlib
+import hashlib
+import logging
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Default-Ablage für vorberechnete Embeddings
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / '.cache'
+
+
+def cache_dir():
+    """Cache-Verzeichnis (EMBEDDING_CACHE_DIR aus .env oder Repo-Root/.cache)"""
+    load_dotenv()
+    return Path(os.getenv('EMBEDDING_CACHE_DIR') or DEFAULT_CACHE_DIR)
+
+
+def templates_key(templates, model_name):
+    """
+    Hash über Inhalt der Command-Templates + Modellname
+
+    Ändert sich command_templates.py (Verben, Reihenfolge, Commands) oder das
+    Modell, ergibt sich ein neuer Key und die Matrix wird neu berechnet.
+    """
+    payload = json.dumps(
+        {
+            'model': model_name,
+            'templates': [[template.command, template.verbs] for template in templates]
+        },
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def load_or_build(prefix, key, build):
+    """
+    lädt eine float32 Matrix memory-mapped aus dem Cache oder baut sie neu
+
+    args:
+        prefix (str): Dateipräfix, z.B. 'command_emb_<modell>_<backend>';
+            veraltete Dateien mit dem gleichen Präfix werden gelöscht
+        key (str): Inhalts-Hash, Teil des Dateinamens
+        build (callable): liefert die Matrix, falls nicht im Cache
+
+    returns:
+        np.ndarray: read-only Matrix (np.memmap, bzw. im Speicher, wenn
+        der Cache nicht geschrieben werden kann)
+    """
+    directory = cache_dir()
+    path = directory / f'{prefix}_{key}.npy'
+
+    if path.exists():
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logging.warning(f"Embedding-Cache {path} unlesbar, baue neu: {e}")
+
+    matrix = np.ascontiguousarray(build(), dtype=np.float32)
+
+    # Atomar schreiben, damit parallele Starts keine halbe Datei lesen
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # z.B. Verzeichnis schreibgeschützt: ohne Cache weiterspielen
+        logging.warning(f"Embedding-Cache konnte nicht geschrieben werden: {e}")
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        matrix.setflags(write=False)
+        return matrix
+
+    # Veraltete Versionen aufräumen, nur gleiches Präfix (Matrizen anderer
+    # Modelle/Backends bleiben liegen), der Key ist das letzte Namensteil
+    for old in directory.glob(f'{prefix}_*.npy'):
+        if old != path and '_' not in old.stem[len(prefix) + 1:]:
+            # z.B. Windows: von einem anderen Prozess noch gemappt
+            with contextlib.suppress(OSError):
+                old.unlink(missing_ok=True)
+
+    logging.info(f"Embedding-Cache geschrieben: {path}")
+    return np.load(path, mmap_mode='r')
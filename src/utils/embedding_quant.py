@@ -0,0 +1,104 @@
+"""
+Quantisierte Ablage der Entity-Embeddings (name_emb, synonyms_emb, description_emb).
+
+Formate:
+    float32  Liste von Floats (bisheriges Format, nötig für Vector Indexes)
+    float16  bytes, 2 Byte pro Dimension
+    int8     bytes, 1 Byte pro Dimension + <feld>_scale (float)
+
+Neo4j speichert bytes als byte[] Property, über Bolt gehen sie als ein Block
+statt als Liste von 64-Bit Floats. Das Format ergibt sich aus dem Wert selbst
+(Liste oder bytes, mit oder ohne _scale), eine Welt kann also gemischt sein.
+"""
+import numpy as np
+
+EMB_FORMATS = ('float32', 'float16', 'int8')
+
+# Felder wie in utils.embedding_utils.ENTITY_EMB_FIELDS
+EMB_FIELDS = ('name_emb', 'synonyms_emb', 'description_emb')
+
+
+def scale_field(field):
+    return f'{field}_scale'
+
+
+def encode_embedding(vector, fmt='float32'):
+    """
+    bringt einen Vektor in das Speicherformat
+
+    args:
+        vector: Liste oder np.ndarray
+        fmt (str): eines von EMB_FORMATS
+
+    returns:
+        tuple: (wert, scale) - scale ist nur bei int8 gesetzt
+    """
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+
+    if fmt == 'float32':
+        return vector.tolist(), None
+
+    if fmt == 'float16':
+        return vector.astype('<f2').tobytes(), None
+
+    if fmt == 'int8':
+        # symmetrisch pro Vektor: größter Betrag -> 127
+        scale = float(np.abs(vector).max()) / 127.0 or 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return quantized.tobytes(), scale
+
+    raise ValueError(f"Unbekanntes Embedding-Format '{fmt}', erlaubt: {', '.join(EMB_FORMATS)}")
+
+
+def decode_embedding(value, scale=None):
+    """
+    liest einen Vektor in jedem Speicherformat als float32
+
+    returns:
+        np.ndarray oder None
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if scale is None:
+            return np.frombuffer(value, dtype='<f2').astype(np.float32)
+        return np.frombuffer(value, dtype=np.int8).astype(np.float32) * np.float32(scale)
+
+    return np.asarray(value, dtype=np.float32)
+
+
+def quantize_props(props, fmt):
+    """
+    ersetzt die Embedding-Properties eines Nodes (in place) durch das
+    gewünschte Format, vorhandene Formate werden vorher dekodiert
+
+    returns:
+        dict: props
+    """
+    for field in EMB_FIELDS:
+        vector = decode_embedding(props.get(field), props.get(scale_field(field)))
+        if vector is None:
+            continue
+        props[field], props[scale_field(field)] = encode_embedding(vector, fmt)
+        if props[scale_field(field)] is None:
+            del props[scale_field(field)]
+    return props
+
+
+def packstream_size(value):
+    """
+    ungefähre Größe eines Property-Werts auf dem Bolt-Protokoll (PackStream)
+
+    Floats: 1 Byte Marker + 8 Byte, bytes: Header + Inhalt
+    """
+    if value is None:
+        return 1
+    if isinstance(value, (bytes, bytearray)):
+        return (2 if len(value) < 256 else 3 if len(value) < 65536 else 5) + len(value)
+    if isinstance(value, float):
+        return 9
+    if isinstance(value, (list, tuple)):
+        header = 1 if len(value) < 16 else 2 if len(value) < 256 else 3
+        return header + sum(packstream_size(item) for item in value)
+    return 9
@@ -1,8 +1,33 @@
+import os
 import logging
-from typing import List
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
-from sentence_transformers import SentenceTransformer, util
-from utils.command_templates import COMMAND_TEMPLATES, CommandTemplate
+import numpy as np
+from sentence_transformers import util
+from utils.command_templates import COMMAND_TEMPLATES
+from utils.embedding_cache import templates_key, load_or_build
+from utils.embedding_backend import embedding_backend, load_encoder
+from utils.encode_batcher import EncodeBatcher
+from utils.embedding_quant import scale_field, decode_embedding
+from utils.log_setup import SAMPLED, compact, configure_logging
+from utils.tracing import traced
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+# Anzahl gecachter Text-Embeddings ("geh", "nimm", "fackel" kommen ständig wieder)
+ENCODE_CACHE_SIZE = 512
+
+# Anzahl gecachter Kandidaten-Matrizen (eine pro Raum/Inventar)
+CANDIDATE_CACHE_SIZE = 64
+
+# Micro-Batching für encode (Server): Sammelfenster in ms, 0 = aus
+ENCODE_BATCH_WINDOW_MS = 0.0
+ENCODE_BATCH_MAX = 32
+
+# Embedding-Felder einer Entity, die beim Matching berücksichtigt werden
+ENTITY_EMB_FIELDS = ('name_emb', 'synonyms_emb', 'description_emb')
 
 # Singleton damit der speicher nicht so schnell ausgeht :)
 
@@ -15,27 +40,95 @@ class EmbeddingUtils:
     """
 
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
-        
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-
-            cls._instance.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
-            cls._instance.util = util
-            
-            cls._instance.command_emb = {}
-            for templates in COMMAND_TEMPLATES:
-                cls._instance.command_emb[templates.command] = cls._instance.model.encode(templates.verbs)
-        
-            logging.basicConfig(
-                filename='parser_debug.log',
-                level=logging.INFO,
-                format='%(asctime)s - %(message)s'
-            )
+
+        # Lock: der Controller erzeugt die Instanz in einem Hintergrund-Thread
+        with cls._lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+
+                # torch, onnx oder onnx-int8 (EMBEDDING_BACKEND), encode() ist gleich
+                instance.backend = embedding_backend()
+                instance.model = load_encoder(MODEL_NAME, instance.backend)
+                instance.util = util
+
+                instance._build_command_matrix()
+
+                # Gleichzeitige encode-Aufrufe mehrerer Sessions zu einem Batch bündeln
+                window_ms = float(os.getenv('ENCODE_BATCH_WINDOW_MS') or ENCODE_BATCH_WINDOW_MS)
+                instance.batcher = None
+                if window_ms > 0:
+                    instance.batcher = EncodeBatcher(
+                        instance._encode_batch,
+                        window_ms=window_ms,
+                        max_batch=int(os.getenv('ENCODE_BATCH_MAX') or ENCODE_BATCH_MAX)
+                    )
+
+                instance._encode_text = lru_cache(maxsize=ENCODE_CACHE_SIZE)(
+                    instance._encode_text_uncached
+                )
+                instance._candidate_cache = OrderedDict()
+                instance._candidate_lock = threading.Lock()
+
+                configure_logging()
+
+                # Erst nach vollständiger Initialisierung sichtbar machen
+                cls._instance = instance
 
         return cls._instance
 
+    def _build_command_matrix(self):
+        """
+        packt alle Template-Verben normalisiert in eine float32 Matrix
+
+        command_matrix: (Anzahl Verben x Dimension), eine Zeile pro Verb
+        command_index:  Zeile -> Index in command_names
+
+        Die Matrix liegt als .npy im Cache und wird beim Warmstart nur
+        memory-mapped geladen statt neu encodiert.
+        """
+        verbs = [verb for template in COMMAND_TEMPLATES for verb in template.verbs]
+        counts = [len(template.verbs) for template in COMMAND_TEMPLATES]
+
+        self.command_matrix = load_or_build(
+            # eine Datei pro Modell und Backend, Wechsel zwischen Backends baut nichts neu
+            f'command_emb_{MODEL_NAME.replace("/", "_")}_{self.backend}',
+            # Backend im Key: int8 liefert leicht andere Vektoren
+            templates_key(COMMAND_TEMPLATES, f'{MODEL_NAME}:{self.backend}'),
+            lambda: self.model.encode(verbs, normalize_embeddings=True, convert_to_numpy=True)
+        )
+        self.command_names = [template.command for template in COMMAND_TEMPLATES]
+        self.command_index = np.repeat(np.arange(len(COMMAND_TEMPLATES)), counts)
+
+        # Sicht pro Command auf die gleiche Matrix (keine Kopie)
+        self.command_emb = {}
+        start = 0
+        for template, count in zip(COMMAND_TEMPLATES, counts):
+            self.command_emb[template.command] = self.command_matrix[start:start + count]
+            start += count
+
+    def _encode_text_uncached(self, text):
+        """normalisiertes float32 Embedding für Verb/Nomen (read-only, wird gecacht)"""
+        if self.batcher is not None:
+            return self.batcher.encode(text)
+
+        text_emb = self.model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
+        text_emb = np.ascontiguousarray(text_emb, dtype=np.float32)
+        text_emb.setflags(write=False)
+        return text_emb
+
+    def _encode_batch(self, texts):
+        """mehrere Texte in einem encode-Aufruf (für den EncodeBatcher)"""
+        matrix = self.model.encode(
+            texts, batch_size=len(texts), normalize_embeddings=True, convert_to_numpy=True
+        )
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        matrix.setflags(write=False)
+        return list(matrix)
+
+    @traced('classify')
     def verb_to_command(self, verb):
 
         result =  {}
@@ -47,25 +140,16 @@ class EmbeddingUtils:
             }
             return result
 
-        result = {
-            'best_command': None,
-            'best_sim': -1.0
-        }
-
-        verb_emb = self.model.encode(verb)
-
-        for command, command_emb in self.command_emb.items():
-
-            similarities = self.util.cos_sim(verb_emb, command_emb)
-            max_sim = similarities.max().item()
+        verb_emb = self._encode_text(verb)
 
-            # logging.info(f"{similarities}")
+        # Alle Verben auf einmal: normalisiert => Skalarprodukt = Cosinus
+        similarities = self.command_matrix @ verb_emb
+        best_row = int(np.argmax(similarities))
 
-            if max_sim > result['best_sim']:
-                result = {
-                    'best_command': command,
-                    'best_sim': max_sim
-                }
+        result = {
+            'best_command': self.command_names[self.command_index[best_row]],
+            'best_sim': float(similarities[best_row])
+        }
 
         # Trashhold... 
         if result['best_sim'] < 0.90:
@@ -76,24 +160,84 @@ class EmbeddingUtils:
 
         return result
     
-    def match_entities(self, query_text: str, candidates: dict):
-
-        logging.info(f"Input query: '{query_text}' | Candidates: {candidates}")
-        result = []
-
-        # Query embedden
-        query_emb = self.model.encode(query_text)
-
-        # Einzeln mit kandidaten vergleichen
-        for candidate in candidates:
-
-            score = self.util.cos_sim(query_emb, candidate['name_emb'])
-            result.append({
-                'id': candidate['id'],
-                'score': score
-            })
-
-        # Nach similarity sortieren
-        result.sort(key=lambda x: x['score'], reverse=True)
-        logging.info(f"Output: '{result}'")
-        return result
\ No newline at end of file
+    def _candidate_matrix(self, candidates):
+        """
+        packt die Embeddings der Kandidaten in eine normalisierte float32 Matrix
+
+        Pro Kandidat eine Zeile je vorhandenem Feld (name, synonyms,
+        description). Gecacht über die Menge der Kandidaten-ids (+ emb_version),
+        ein Raum wird also nur beim ersten Betreten gepackt.
+
+        returns:
+            tuple: (ids, matrix, owners) mit owners: Zeile -> Index in ids
+        """
+        key = frozenset((candidate['id'], candidate.get('emb_version')) for candidate in candidates)
+
+        with self._candidate_lock:
+            cached = self._candidate_cache.get(key)
+            if cached is not None:
+                self._candidate_cache.move_to_end(key)
+                return cached
+
+        ids = [candidate['id'] for candidate in candidates]
+        rows, owners = [], []
+        for index, candidate in enumerate(candidates):
+            for field in ENTITY_EMB_FIELDS:
+                # float32 Liste/Array oder quantisiert (float16/int8 bytes)
+                vector = decode_embedding(candidate.get(field), candidate.get(scale_field(field)))
+                if vector is not None:
+                    rows.append(vector)
+                    owners.append(index)
+
+        dimension = self.command_matrix.shape[1]
+        matrix = np.asarray(rows, dtype=np.float32).reshape(-1, dimension)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.ascontiguousarray(matrix / np.maximum(norms, 1e-12))
+
+        entry = (ids, matrix, np.asarray(owners, dtype=np.intp))
+
+        with self._candidate_lock:
+            self._candidate_cache[key] = entry
+            if len(self._candidate_cache) > CANDIDATE_CACHE_SIZE:
+                self._candidate_cache.popitem(last=False)
+
+        return entry
+
+    @traced('match')
+    def match_entities(self, query_text: str, candidates: list, top_k: int = None):
+        """
+        sortiert Kandidaten nach Ähnlichkeit zum Suchtext
+
+        args:
+            query_text (str): z.B. das Nomen aus dem Parser
+            candidates (list): dicts mit 'id' und name_emb/synonyms_emb/description_emb
+            top_k (int): nur die besten k Treffer (default: alle)
+
+        returns:
+            list: [{'id', 'score'}] absteigend nach score (float)
+        """
+
+        if not candidates:
+            return []
+
+        ids, matrix, owners = self._candidate_matrix(candidates)
+
+        # Query embedden, ein Matmul über alle Felder aller Kandidaten
+        query_emb = self._encode_text(query_text)
+        similarities = matrix @ query_emb
+
+        # Bestes Feld pro Kandidat
+        scores = np.full(len(ids), -1.0, dtype=np.float32)
+        np.maximum.at(scores, owners, similarities)
+
+        order = np.argsort(-scores, kind='stable')[:top_k]
+        result = [{'id': ids[index], 'score': float(scores[index])} for index in order]
+
+        # Kandidaten nur als ids, ihre Embeddings gehören nicht ins Log
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "Match '%s' | Kandidaten: %s | Output: %s",
+                query_text, compact([candidate['id'] for candidate in candidates]), compact(result),
+                extra={**SAMPLED, 'event': 'match'}
+            )
+        return result
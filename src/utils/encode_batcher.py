@@ -0,0 +1,110 @@
+import time
+import queue
+import logging
+import statistics
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from utils.stats import summarize, percentile
+
+# Anzahl Batches/Anfragen, über die die Metriken gebildet werden
+METRICS_WINDOW = 2048
+
+
+class EncodeBatcher:
+    """
+    Sammelt encode-Anfragen mehrerer Threads zu einem Batch.
+
+    Die erste Anfrage öffnet ein Fenster von window_ms, alles was bis dahin
+    (oder bis max_batch) dazukommt, läuft mit einem einzigen encode-Aufruf.
+    Gleiche Texte im Batch werden nur einmal encodiert. Jeder Aufrufer
+    bekommt ein Future, encode() wartet darauf.
+
+    Größeres Fenster = größere Batches (Durchsatz), aber mehr Wartezeit pro
+    Befehl (Latenz). metrics() liefert beides zum Einstellen.
+    """
+
+    def __init__(self, encode_batch, window_ms=5.0, max_batch=32):
+        """
+        args:
+            encode_batch (callable): Liste von Texten -> Liste/Matrix von Vektoren
+            window_ms (float): Sammelfenster ab der ersten Anfrage
+            max_batch (int): Batch wird spätestens bei so vielen Anfragen gestartet
+        """
+        self.encode_batch = encode_batch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue()
+        self._batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._waits_ms = deque(maxlen=METRICS_WINDOW)
+        self._metrics_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._worker, name='encode-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        """stellt einen Text in die Warteschlange, liefert ein Future mit dem Vektor"""
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def encode(self, text):
+        return self.submit(text).result()
+
+    def _collect(self):
+        """blockiert bis zur ersten Anfrage, sammelt dann bis Fenster oder max_batch"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+            try:
+                vectors = dict(zip(texts, self.encode_batch(texts)))
+            except Exception as e:
+                logging.exception("Batch-Encoding fehlgeschlagen")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for text, future, queued in batch:
+                future.set_result(vectors[text])
+
+            with self._metrics_lock:
+                self._batch_sizes.append(len(batch))
+                self._waits_ms.extend((started - queued) * 1000 for _, _, queued in batch)
+
+    def metrics(self):
+        """
+        returns:
+            dict: batches, batch_size (mean/p50/max) und queue_wait (summarize, ms)
+        """
+        with self._metrics_lock:
+            sizes = sorted(self._batch_sizes)
+            waits = list(self._waits_ms)
+
+        return {
+            'batches': len(sizes),
+            'batch_size': {
+                'mean': statistics.fmean(sizes) if sizes else 0.0,
+                'p50': percentile(sizes, 50),
+                'max': sizes[-1] if sizes else 0,
+            },
+            'queue_wait': summarize(waits),
+        }
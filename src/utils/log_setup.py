@@ -0,0 +1,158 @@
+"""
+Logging für Spiel und Server: ein Hintergrund-Thread schreibt, der Zug nicht.
+
+configure_logging() ersetzt die basicConfig-Aufrufe. Die Log-Aufrufe hängen
+nur den Record an eine Queue (QueueHandler), Formatieren und Schreiben in
+die Datei macht ein QueueListener-Thread. Argumente werden erst dort
+formatiert, deshalb übergeben die Aufrufer Zusammenfassungen (compact,
+state_summary) statt der großen Strukturen und verändern sie danach nicht.
+
+.env:
+    LOG_LEVEL        DEBUG, INFO (default), WARNING, ...
+                     DEBUG enthält die Details pro Zug (State, Parser, Matching)
+    LOG_FORMAT       text (default) oder json (eine Zeile pro Record)
+    LOG_SAMPLE_RATE  Anteil der Detail-Records pro Zug, die geschrieben
+                     werden (0..1, default 1). Warnungen und Fehler immer.
+"""
+import os
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from dotenv import load_dotenv
+
+DEFAULT_FORMAT = '%(asctime)s - %(message)s'
+
+# extra= für Detail-Records pro Zug, die der Sampling-Filter ausdünnt
+SAMPLED = {'sampled': True}
+
+# Felder, die in Logs nie ausgeschrieben werden (Embeddings, lange Texte)
+OMITTED_SUFFIXES = ('_emb', '_emb_scale')
+OMITTED_FIELDS = {'description'}
+
+# Listen werden nach so vielen Einträgen abgeschnitten
+MAX_ITEMS = 8
+
+_listener = None
+_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """lässt von den Records mit extra=SAMPLED nur den Anteil rate durch"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False) or record.levelno >= logging.WARNING:
+            return True
+        return self.rate >= 1.0 or random.random() < self.rate
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler ohne Formatierung im aufrufenden Thread.
+
+    Der Standard-QueueHandler formatiert die Nachricht schon in prepare(),
+    also im Zug. Hier wird nur der Traceback sofort zu Text, msg und args
+    formatiert erst der Listener.
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """eine JSON-Zeile pro Record: ts, level, thread, msg und ggf. event"""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'event', None):
+            entry['event'] = record.event
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def compact(value, depth=3):
+    """
+    verkleinert eine Struktur fürs Log: ohne Embeddings und Beschreibungen,
+    lange Listen gekürzt, Arrays/Bytes nur als Länge
+    """
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f'{{{len(value)} keys}}'
+        return {
+            key: compact(item, depth - 1) for key, item in value.items()
+            if not (isinstance(key, str) and (key.endswith(OMITTED_SUFFIXES) or key in OMITTED_FIELDS))
+        }
+    if isinstance(value, (list, tuple)):
+        if depth <= 0:
+            return f'[{len(value)} items]'
+        items = [compact(item, depth - 1) for item in value[:MAX_ITEMS]]
+        if len(value) > MAX_ITEMS:
+            items.append(f'... +{len(value) - MAX_ITEMS}')
+        return items
+    if isinstance(value, (bytes, bytearray)):
+        return f'<{len(value)} bytes>'
+    if hasattr(value, 'shape'):
+        return f'<array {tuple(value.shape)}>'
+    return value
+
+
+def state_summary(game_state):
+    """Spielzustand nur als ids: Ort, Items, Exits, Inventar"""
+    return {
+        key: [entity.get('id') for entity in entities or []]
+        for key, entities in game_state.items()
+    }
+
+
+def configure_logging(filename='parser_debug.log'):
+    """
+    richtet Queue, Listener-Thread und Datei-Handler ein (nur beim ersten Aufruf)
+
+    args:
+        filename (str): Logdatei, falls LOG_FILE nicht gesetzt ist
+    """
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            return
+
+        load_dotenv()
+
+        level = os.getenv('LOG_LEVEL', 'INFO').upper()
+        rate = float(os.getenv('LOG_SAMPLE_RATE') or 1.0)
+
+        file_handler = logging.FileHandler(os.getenv('LOG_FILE') or filename, encoding='utf-8')
+        if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = LazyQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(rate))
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+
+        _listener = QueueListener(log_queue, file_handler)
+        _listener.start()
+        atexit.register(_listener.stop)
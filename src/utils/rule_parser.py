@@ -0,0 +1,106 @@
+import re
+
+from utils.command_templates import COMMAND_TEMPLATES
+
+# Wörter, die zwischen Verb und Objekt stehen dürfen
+FILLER_WORDS = {
+    'der', 'die', 'das', 'den', 'dem', 'des',
+    'ein', 'eine', 'einen', 'einem', 'einer',
+    'zu', 'zum', 'zur', 'in', 'im', 'ins', 'nach', 'auf', 'an', 'am', 'ans',
+    'aus', 'von', 'vom', 'mit', 'über', 'durch', 'hin', 'her',
+    'dir', 'mir', 'mich', 'dich', 'sich',
+    'bitte', 'doch', 'mal', 'jetzt', 'schnell', 'nun',
+}
+
+# Mindestlänge für Teilwort-Treffer ("wald" -> "Finsterwald")
+MIN_SUFFIX_LEN = 4
+
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)?")
+
+
+class RuleParser:
+    """
+    Schneller Lexikon-Parser für einfache Verb+Nomen-Eingaben.
+
+    Kennt alle Verben aus COMMAND_TEMPLATES (inkl. trennbarer Formen wie
+    "heb ... auf") und löst "geh wald" oder "nimm die fackel" ohne spaCy auf.
+    Ist er sich nicht sicher, liefert er None und der Dependency-Parser
+    übernimmt.
+    """
+
+    def __init__(self, templates=COMMAND_TEMPLATES):
+
+        self.verbs = set()
+        self.separable_verbs = set()
+
+        for template in templates:
+            for verb in template.verbs:
+                parts = verb.lower().split()
+                if len(parts) == 1:
+                    self.verbs.add(parts[0])
+                elif len(parts) == 2:
+                    self.separable_verbs.add((parts[0], parts[1]))
+
+    @staticmethod
+    def entity_vocabulary(entity_names):
+        """alle Wörter aus den Entity-Namen (lowercase)"""
+        vocabulary = set()
+        for name in entity_names or []:
+            vocabulary.update(token.lower() for token in TOKEN_PATTERN.findall(name))
+        return vocabulary
+
+    @staticmethod
+    def _is_entity_word(word, vocabulary):
+        if word in vocabulary:
+            return True
+        return len(word) >= MIN_SUFFIX_LEN and any(known.endswith(word) for known in vocabulary)
+
+    def parse(self, input_text, entity_names=None):
+        """
+        versucht die Eingabe ohne spaCy zu verstehen
+
+        args:
+            input_text (str): Spielereingabe
+            entity_names (list): Namen der aktuell sichtbaren Entities
+
+        returns:
+            dict: gleiches Format wie SmartParser.parse, oder None wenn unsicher
+        """
+        tokens = TOKEN_PATTERN.findall(input_text)
+        words = [token.lower() for token in tokens]
+
+        if not words:
+            return None
+
+        # Verb bestimmen: trennbar ("heb ... auf"), vorne ("nimm ...") oder
+        # hinten ("fackel nehmen")
+        if len(words) > 1 and (words[0], words[-1]) in self.separable_verbs:
+            verb = f'{words[0]} {words[-1]}'
+            rest = list(zip(tokens[1:-1], words[1:-1]))
+        elif words[0] in self.verbs:
+            verb = words[0]
+            rest = list(zip(tokens[1:], words[1:]))
+        elif words[-1] in self.verbs:
+            verb = words[-1]
+            rest = list(zip(tokens[:-1], words[:-1]))
+        else:
+            return None
+
+        content = [(token, word) for token, word in rest if word not in FILLER_WORDS]
+
+        noun = None
+        if content:
+            vocabulary = self.entity_vocabulary(entity_names)
+
+            # Jedes verbleibende Wort muss zu einer bekannten Entity gehören
+            if not all(self._is_entity_word(word, vocabulary) for _, word in content):
+                return None
+
+            noun = content[-1][0]
+
+        return {
+            'verb': verb,
+            'noun': noun,
+            'adjects': None,
+            'raw': input_text
+        }
@@ -1,6 +1,11 @@
 import spacy
 import logging
+import threading
+from collections import Counter
 from dotenv import load_dotenv
+from utils.rule_parser import RuleParser
+from utils.log_setup import SAMPLED, compact, configure_logging
+from utils.tracing import traced
 
 load_dotenv(dotenv_path='../.env')
 
@@ -8,20 +13,53 @@ class SmartParser:
 
     def __init__(self):
 
+        # Alle Komponenten werden gebraucht: pos_ (morphologizer, attribute_ruler
+        # über die Tags), lemma_ (lemmatizer), dep_ und der Baum (parser)
         self.parsing_model = spacy.load("de_dep_news_trf")
 
-        logging.basicConfig(
-            filename='parser_debug.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(message)s'
-        )
+        # Schneller Lexikon-Tier vor dem Transformer
+        self.rule_parser = RuleParser()
+
+        # Wie oft welcher Tier geantwortet hat ('rule' / 'dependency'), der Server
+        # teilt einen Parser zwischen allen Worker-Threads
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+        configure_logging()
+
+    def _count(self, tier):
+        with self._stats_lock:
+            self.stats[tier] += 1
 
-    def parse(self, input_text):
+    def tier_counts(self):
+        """Kopie von stats (thread-safe)"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def hit_rate(self):
+        """Anteil der Eingaben, die ohne Transformer aufgelöst wurden"""
+        counts = self.tier_counts()
+        total = sum(counts.values())
+        return counts.get('rule', 0) / total if total else 0.0
+
+    def _fast_path(self, input_text, entity_names):
+        """leere Eingaben und einfache Verb+Nomen-Sätze ohne spaCy (sonst None)"""
 
         if not input_text or not input_text.strip():
-            return [{'verb': None, 'noun': None, 'adjects': None, 'raw': input_text}]
-    
-        input_syntax = self.parsing_model(input_text)
+            self._count('rule')
+            return {'verb': None, 'noun': None, 'adjects': None, 'raw': input_text, 'tier': 'rule'}
+
+        fast = self.rule_parser.parse(input_text, entity_names)
+        if fast is not None:
+            fast['tier'] = 'rule'
+            self._count('rule')
+
+        return fast
+
+    def _extract(self, input_syntax, input_text):
+        """Verb und Nomen aus einem spaCy Doc"""
+
+        self._count('dependency')
 
         verb = []
         
@@ -29,14 +67,10 @@ class SmartParser:
             'verb': None,
             'noun': None,
             'adjects': None,
-            'raw': input_text
+            'raw': input_text,
+            'tier': 'dependency'
         }
 
-        # Detailliertes Logging des Spacy Doc
-        logging.info(f"=== Parsing Input: '{input_text}' ===")
-        for token in input_syntax:
-            logging.info(f"  Token: '{token.text:15}' | POS: {token.pos_:8} | DEP: {token.dep_:10} | Lemma: {token.lemma_:15} | Head: {token.head.text}")
-
         # Command bauen
         for token in input_syntax:
 
@@ -53,7 +87,73 @@ class SmartParser:
                 results['noun'] = token.text
 
         results['verb'] = ' '.join(verb)
-        
-        logging.info(f"=== Parsing Output: {results} ===")
+        return results
+
+    @traced('parse')
+    def parse(self, input_text, entity_names=None):
+        """
+        args:
+            input_text (str): Spielereingabe
+            entity_names (list): Namen der sichtbaren Entities (für den Fast-Path)
+
+        returns:
+            list: [{'verb', 'noun', 'adjects', 'raw', 'tier'}]
+        """
+
+        # Fast-Path: einfache Verb+Nomen-Eingaben ohne spaCy
+        fast = self._fast_path(input_text, entity_names)
+        if fast is not None:
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("=== Parsing Output (rule): %s ===", compact(fast), extra={**SAMPLED, 'event': 'parse'})
+            return [fast]
+
+        input_syntax = self.parsing_model(input_text)
+
+        results = self._extract(input_syntax, input_text)
+
+        # Detailliertes Logging des Spacy Doc (nur bei LOG_LEVEL=DEBUG), ein Record pro Eingabe
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            tokens = [(token.text, token.pos_, token.dep_, token.lemma_, token.head.text) for token in input_syntax]
+            logging.debug(
+                "=== Parsing '%s' === Tokens (text, pos, dep, lemma, head): %s | Output: %s",
+                input_text, compact(tokens), compact(results), extra={**SAMPLED, 'event': 'parse'}
+            )
+
         return [results]
- 
\ No newline at end of file
+
+    def parse_many(self, texts, entity_names=None, batch_size=64, n_process=1):
+        """
+        parst viele Eingaben auf einmal über nlp.pipe
+
+        Kein Logging pro Token, Fast-Path wie bei parse().
+
+        args:
+            texts (list): Spielereingaben
+            entity_names (list): Namen der sichtbaren Entities (für den Fast-Path)
+            batch_size (int): Texte pro spaCy-Batch
+            n_process (int): Anzahl Prozesse für nlp.pipe
+
+        returns:
+            list: pro Text das Ergebnis von parse() (Liste mit einem dict)
+        """
+        results = [None] * len(texts)
+        pending = []
+
+        for index, text in enumerate(texts):
+            fast = self._fast_path(text, entity_names)
+            if fast is not None:
+                results[index] = [fast]
+            else:
+                pending.append((index, text))
+
+        docs = self.parsing_model.pipe(
+            (text for _, text in pending),
+            batch_size=batch_size,
+            n_process=n_process
+        )
+
+        for (index, text), doc in zip(pending, docs):
+            results[index] = [self._extract(doc, text)]
+
+        logging.info("parse_many: %d Eingaben, %d über spaCy", len(texts), len(pending))
+        return results
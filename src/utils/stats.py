@@ -0,0 +1,27 @@
+import statistics
+
+
+def percentile(ordered, q):
+    """Perzentil (nearest rank) aus einer sortierten Liste"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(timings):
+    """
+    fasst Laufzeiten zusammen
+
+    returns:
+        dict: n, mean, p50, p95, p99, max (alles in ms)
+    """
+    ordered = sorted(timings)
+    return {
+        'n': len(ordered),
+        'mean_ms': statistics.fmean(ordered) if ordered else 0.0,
+        'p50_ms': percentile(ordered, 50),
+        'p95_ms': percentile(ordered, 95),
+        'p99_ms': percentile(ordered, 99),
+        'max_ms': ordered[-1] if ordered else 0.0,
+    }
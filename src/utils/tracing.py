@@ -0,0 +1,212 @@
+"""
+Latenz-Tracing pro Zug: ein Span pro Stufe (parse, classify, match, mutate,
+state, render) mit den DB-Queries (db.<QUERY>) als verschachtelte Spans.
+
+Jede Stufe hat ein rollendes Histogramm der letzten Laufzeiten im Prozess.
+dump() schreibt es ins Log, auf Wunsch (SIGUSR1) und beim Beenden. Zusätzlich
+lässt sich ein Chrome-Trace (Trace Event Format, JSON) schreiben, der in
+chrome://tracing oder ui.perfetto.dev angezeigt wird.
+
+Ausgeschaltet liefert span() einen geteilten nullcontext, traced() ruft
+die Funktion direkt auf. Es kostet also nur eine Abfrage von None.
+
+.env:
+    GAME_TRACE       1 = an (default 0)
+    GAME_TRACE_FILE  Chrome-Trace beim Beenden schreiben, z.B. trace.json
+"""
+import os
+import json
+import time
+import atexit
+import signal
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import nullcontext
+from collections import defaultdict, deque
+
+from utils.stats import summarize
+
+# Laufzeiten pro Stufe, über die das Histogramm gebildet wird
+STATS_WINDOW = 4096
+
+# Spans, die für den Chrome-Trace aufgehoben werden (älteste fallen raus)
+MAX_EVENTS = 100_000
+
+# Obergrenzen der Histogramm-Buckets in ms
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+_NULL_SPAN = nullcontext()
+
+# Name des offenen Spans (pro Thread bzw. asyncio-Task)
+_current = contextvars.ContextVar('span', default=None)
+
+_tracer = None
+_lock = threading.Lock()
+
+
+def histogram(timings):
+    """zählt Laufzeiten (ms) in HISTOGRAM_BUCKETS_MS, der letzte Bucket ist offen"""
+    counts = dict.fromkeys([f'<={bound}ms' for bound in HISTOGRAM_BUCKETS_MS] + [f'>{HISTOGRAM_BUCKETS_MS[-1]}ms'], 0)
+    for ms in timings:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if ms <= bound:
+                counts[f'<={bound}ms'] += 1
+                break
+        else:
+            counts[f'>{HISTOGRAM_BUCKETS_MS[-1]}ms'] += 1
+    return counts
+
+
+class Tracer:
+    """sammelt abgeschlossene Spans: Laufzeiten pro Name und Events für den Trace"""
+
+    def __init__(self, trace_file=None, window=STATS_WINDOW, max_events=MAX_EVENTS):
+        self.trace_file = trace_file
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end, parent, args):
+        with self._lock:
+            self._durations[name].append((end - start) * 1000)
+            self._events.append((name, start, end, threading.get_ident(), parent, args))
+
+    def summary(self):
+        """
+        returns:
+            dict: Span-Name -> summarize() der letzten Laufzeiten + histogram
+        """
+        with self._lock:
+            durations = {name: list(timings) for name, timings in self._durations.items()}
+        return {
+            name: {**summarize(timings), 'histogram': histogram(timings)}
+            for name, timings in sorted(durations.items())
+        }
+
+    def chrome_trace(self):
+        """Spans als Trace Event Format (complete events, Zeiten in µs)"""
+        with self._lock:
+            events = list(self._events)
+
+        pid = os.getpid()
+        trace_events = []
+        for name, start, end, thread, parent, args in events:
+            trace_events.append({
+                'name': name,
+                'cat': name.split('.')[0],
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': pid,
+                'tid': thread,
+                'args': {'parent': parent, **args} if parent else args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'parent', 'token', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self.token = _current.set(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _current.reset(self.token)
+        self.tracer.record(self.name, self.start, end, self.parent, self.args)
+        return False
+
+
+def span(name, **args):
+    """
+    Context-Manager für eine Stufe, z.B. with span('db.SNAPSHOT'): ...
+
+    args:
+        name (str): Stufe, Präfix vor dem Punkt ist die Kategorie im Trace
+        **args: zusätzliche Angaben für den Chrome-Trace
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, args)
+
+
+def traced(name):
+    """Decorator: die ganze Funktion als Span name"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _Span(_tracer, name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def tracer():
+    """der aktive Tracer oder None"""
+    return _tracer
+
+
+def dump():
+    """schreibt das Histogramm ins Log und den Chrome-Trace (falls GAME_TRACE_FILE)"""
+    active = _tracer
+    if active is None:
+        return
+
+    for name, stats in active.summary().items():
+        logging.info(
+            "Trace %s: n=%d p50=%.1fms p95=%.1fms p99=%.1fms max=%.1fms %s",
+            name, stats['n'], stats['p50_ms'], stats['p95_ms'], stats['p99_ms'], stats['max_ms'],
+            {bucket: count for bucket, count in stats['histogram'].items() if count}
+        )
+
+    if active.trace_file:
+        active.export(active.trace_file)
+        logging.info("Chrome-Trace geschrieben: %s", active.trace_file)
+
+
+def enable(trace_file=None):
+    """
+    schaltet das Tracing ein (einmalig), dump() läuft bei SIGUSR1 und beim Beenden
+
+    Vorher configure_logging() aufrufen: atexit läuft rückwärts, dump() muss
+    vor dem Stoppen des QueueListeners loggen.
+    """
+    global _tracer
+
+    with _lock:
+        if _tracer is not None:
+            return _tracer
+
+        _tracer = Tracer(trace_file=trace_file)
+        atexit.register(dump)
+
+        # Signal-Handler gehen nur im Haupt-Thread (und nicht unter Windows).
+        # dump() läuft in einem eigenen Thread: das Signal kann mitten in record()
+        # ankommen, der Handler würde dann auf den schon gehaltenen Lock warten
+        if hasattr(signal, 'SIGUSR1') and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGUSR1, lambda signum, frame: threading.Thread(target=dump, name='trace-dump').start())
+
+        return _tracer
+
+
+def configure_tracing():
+    """schaltet das Tracing ein, wenn GAME_TRACE=1 gesetzt ist"""
+    if os.getenv('GAME_TRACE', '0') == '1':
+        enable(trace_file=os.getenv('GAME_TRACE_FILE') or None)
@@ -1,18 +1,117 @@
 from rich.prompt import Prompt
 from rich.console import Console
+from rich.control import Control
 from rich.layout import Layout
+from rich.live import Live
 from rich.panel import Panel
+from rich.cells import cell_len
+from rich.segment import ControlType, Segment
+from contextlib import contextmanager
 import os
-import platform
+import sys
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+PROMPT = 'What? '
+
+# Zeilen unter den Panels: Statusmeldung, Eingabezeile, eine Leerzeile für das Enter
+# (nur beim input()-Fallback, die tastenweise Eingabe gibt keinen Zeilenumbruch aus)
+STATUS_ROWS = 2
+PROMPT_ROWS = 1
+SPACER_ROWS = 1
+
+
+class CachedRegion:
+    """
+    Inhalt eines Layout-Bereichs, der nur einmal pro Größe gerendert wird.
+    Danach liefert er die fertigen Zeilen, das Layout muss das Panel
+    (Rahmen, Markup, Umbruch) bei einem Refresh nicht neu bauen.
+    """
+
+    def __init__(self, renderable):
+        self.renderable = renderable
+        self._size = None
+        self._lines = None
+
+    def __rich_console__(self, console, options):
+        size = (options.max_width, options.height)
+        if size != self._size:
+            self._lines = console.render_lines(self.renderable, options, pad=True)
+            self._size = size
+
+        new_line = Segment.line()
+        for line in self._lines:
+            yield from line
+            yield new_line
+
+
+@contextmanager
+def _single_keys():
+    """Terminal liest Taste für Taste und ohne Echo (POSIX), Ctrl+C bleibt ein Signal"""
+    if termios is None or not sys.stdin.isatty():
+        yield
+        return
+
+    fd = sys.stdin.fileno()
+    old = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+
+
+def _read_key():
+    """eine Taste, Pfeil- und Funktionstasten als ''"""
+    if msvcrt is not None:
+        key = msvcrt.getwch()
+        if key in ('\x00', '\xe0'):
+            msvcrt.getwch()
+            return ''
+        return key
+
+    key = sys.stdin.read(1)
+    if key == '\x1b':
+        # Escape-Sequenz (z.B. Pfeiltasten: ESC [ A) bis zum Endzeichen überlesen
+        if sys.stdin.read(1) in ('[', 'O'):
+            while not '@' <= sys.stdin.read(1) <= '~':
+                pass
+        return ''
+    return key
 
 
 class GameView:
-    
+    """
+    Rich-Oberfläche mit vier Panels (Ort, Items, Exits, Inventar).
+
+    Live-Modus (GAME_VIEW=live, default im Terminal): eine dauerhafte
+    rich.live.Live-Anzeige auf dem Alternate Screen statt clear + print.
+    Panels werden nur neu gebaut, wenn sich ihr Inhalt (Hash) geändert
+    hat, und ohne Änderung wird gar nicht neu gezeichnet. Die Eingabe
+    steht in einer festen Zeile unter den Panels.
+    classic: wie früher Bildschirm leeren und das Layout neu ausgeben.
+    """
+
     def __init__(self):
         self.console = Console()
         self.layout = Layout()
         self._create_layout()
-    
+
+        self.live_mode = os.getenv('GAME_VIEW', 'live') == 'live' and self.console.is_terminal
+        self._live = None
+        self._hashes = {}
+        self._dirty = True
+        self._size = None
+
     def _create_layout(self):
 
         # Horizontal aufteilen
@@ -27,7 +126,17 @@ class GameView:
             Layout(name='exits', ratio=2)
         )
 
-    def show_welcome(self):
+        # Bildschirm für den Live-Modus: Panels + Status + Eingabezeile
+        self.screen = Layout()
+        self.screen.split_column(
+            self.layout,
+            # ' ' statt '': ein leerer Inhalt zeigt den Layout-Platzhalter
+            Layout(' ', name='status', size=STATUS_ROWS),
+            Layout(' ', name='prompt', size=PROMPT_ROWS),
+            Layout(' ', name='spacer', size=SPACER_ROWS)
+        )
+
+    def show_welcome(self, readiness=None):
         self.console.clear()
         self.console.print(Panel(
             'Willkommen beim RagVenture',
@@ -36,41 +145,108 @@ class GameView:
             padding=(2, 2)
         ))
 
+        # Ladezustand der Hintergrund-Komponenten
+        for label, ready in (readiness or {}).items():
+            if ready:
+                self.console.print(f"[green]✓[/green] {label} bereit")
+            else:
+                self.console.print(f"[yellow]…[/yellow] {label} lädt")
+
+    def show_ready(self, label, error=None):
+        """meldet eine fertig geladene Komponente (wird aus Worker-Threads aufgerufen)"""
+
+        # Im Live-Modus ist der Welcome-Screen schon weg
+        if self._live is not None:
+            return
+
+        if error:
+            self.console.print(f"[red]✗[/red] {label}: {error}")
+        else:
+            self.console.print(f"[green]✓[/green] {label} bereit")
+
+    def loading(self, label):
+        """Spinner, solange auf eine Komponente gewartet wird"""
+        if self._live is not None:
+            return self._live_status(f"[yellow]Lade {label}...[/yellow]")
+        return self.console.status(f"Lade {label}...")
+
+    @contextmanager
+    def _live_status(self, text):
+        """Text in der Statuszeile, solange der Block läuft"""
+        self._set('status', text, panel=False)
+        self._draw()
+        try:
+            yield
+        finally:
+            self._set('status', '', panel=False)
+
+    def _set(self, name, content, panel=True):
+        """
+        ersetzt den Inhalt eines Bereichs nur, wenn sich sein Hash geändert hat;
+        gerendert wird er erst beim nächsten Refresh und dann nur einmal pro Größe
+        """
+        content_hash = hash(content)
+        if self._hashes.get(name) == content_hash:
+            return
+
+        self._hashes[name] = content_hash
+        self.screen[name].update(CachedRegion(Panel(content) if panel else content))
+        self._dirty = True
+
     def update_panels(self, location, items, exits, inventory):
 
         location_formated = f"[bold yellow]{location[0]['name']}[/bold yellow]\n{location[0]['description']}"
 
         if items:
-            items_formated = '[bold yellow]Items[/bold yellow]'    
-            for item in items:
-                items_formated += f'\n{item['name']}. {item['description']}'
+            items_formated = '\n'.join(
+                ['[bold yellow]Items[/bold yellow]'] + [f"{item['name']}. {item['description']}" for item in items]
+            )
         else:
             items_formated = "Keine Gegenstände zu sehen"
 
         if exits:
-            exits_formated = '[bold yellow]Exits[/bold yellow]'    
-            for exit in exits:
-                exits_formated += f'\n{exit['name']}'
+            exits_formated = '\n'.join(['[bold yellow]Exits[/bold yellow]'] + [exit['name'] for exit in exits])
         else:
             exits_formated = "Keine Ausgänge zu sehen"
 
         if inventory:
-            inventory_formated = '[bold yellow]Inventar[/bold yellow]'    
-            for item in inventory:
-                inventory_formated += f'\n{item['name']}'
+            inventory_formated = '\n'.join(['[bold yellow]Inventar[/bold yellow]'] + [item['name'] for item in inventory])
         else:
             inventory_formated = "Nichts dabei"
 
-        self.layout['location'].update(Panel(location_formated))
-        self.layout['items'].update(Panel(items_formated))
-        self.layout['exits'].update(Panel(exits_formated))
-        self.layout['inventory'].update(Panel(inventory_formated))
+        self._set('location', location_formated)
+        self._set('items', items_formated)
+        self._set('exits', exits_formated)
+        self._set('inventory', inventory_formated)
+
+    def _draw(self):
+        """zeichnet den Live-Screen neu, falls sich etwas geändert hat"""
+        if self._live is None:
+            self._live = Live(
+                self.screen,
+                console=self.console,
+                screen=True,
+                auto_refresh=False,
+                redirect_stdout=False,
+                redirect_stderr=False
+            )
+            self._live.start()
+            self._dirty = True
+
+        # Nach einer Größenänderung des Terminals muss alles neu gezeichnet werden
+        if self._dirty or self.console.size != self._size:
+            self._size = self.console.size
+            self._live.refresh()
+            self._dirty = False
 
     def refresh(self, status=''):
-        if platform.system() == 'Windows':
-            os.system('cls')
-        else:
-            os.system('clear')
+        if self.live_mode:
+            self._set('status', status, panel=False)
+            self._draw()
+            return
+
+        # classic: ohne Subprozess leeren und komplett neu ausgeben
+        self.console.clear()
 
         max_height = self.console.height - 4
         self.console.print(self.layout, crop=True, height=max_height)
@@ -78,4 +254,58 @@ class GameView:
             self.console.print(f"\n{status}\n")
 
     def get_input(self):
-        return Prompt.ask('What? ')
+        if self._live is None:
+            return Prompt.ask(PROMPT)
+
+        # Eingabezeile direkt ansteuern: console.print würde den Live-Screen neu zeichnen
+        row = self.console.height - PROMPT_ROWS - SPACER_ROWS
+        self.console.show_cursor(True)
+        try:
+            if (termios is not None and sys.stdin.isatty()) or msvcrt is not None:
+                return self._read_line(row)
+
+            # kein Terminal zum tastenweisen Lesen: normales input(), danach alles neu zeichnen
+            self._show_input(row, '')
+            self._dirty = True
+            return input()
+        finally:
+            self.console.show_cursor(False)
+
+    def _show_input(self, row, text):
+        """Eingabezeile: Prompt + das Ende des Textes, das in die Zeile passt"""
+        width = max(self.console.width - cell_len(PROMPT) - 1, 0)
+        while cell_len(text) > width:
+            text = text[1:]
+
+        self.console.control(Control.move_to(0, row), Control((ControlType.ERASE_IN_LINE, 2)))
+        self.console.file.write(PROMPT + text)
+        self.console.file.flush()
+
+    def _read_line(self, row):
+        """
+        einzeilige Eingabe: nichts bricht um und nichts scrollt den Screen,
+        langer Text läuft nach links aus der Zeile
+        """
+        buffer = []
+        with _single_keys():
+            self._show_input(row, '')
+            while True:
+                key = _read_key()
+                if key in ('\r', '\n'):
+                    return ''.join(buffer)
+                if key == '\x03':
+                    raise KeyboardInterrupt
+                if key in ('\x04', '\x1a') and not buffer:
+                    raise EOFError
+                if key in ('\x7f', '\x08'):
+                    if buffer:
+                        buffer.pop()
+                elif key.isprintable():
+                    buffer.append(key)
+                self._show_input(row, ''.join(buffer))
+
+    def close(self):
+        """beendet den Live-Screen und stellt das Terminal wieder her"""
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
@@ -0,0 +1,40 @@
+from contextlib import nullcontext
+
+
+class NullView:
+    """
+    View ohne Ausgabe für Headless-Betrieb (Replay, Benchmarks).
+
+    Hat die gleiche Schnittstelle wie GameView, merkt sich aber nur den
+    letzten Zustand statt ihn zu rendern.
+    """
+
+    def __init__(self):
+        self.panels = {}
+        self.status = ''
+
+    def show_welcome(self, readiness=None):
+        pass
+
+    def show_ready(self, label, error=None):
+        pass
+
+    def loading(self, label):
+        return nullcontext()
+
+    def update_panels(self, location, items, exits, inventory):
+        self.panels = {
+            'location': location,
+            'items': items,
+            'exits': exits,
+            'inventory': inventory
+        }
+
+    def refresh(self, status=''):
+        self.status = status
+
+    def close(self):
+        pass
+
+    def get_input(self):
+        raise RuntimeError("NullView hat keine Eingabe - Befehle über replay() einspielen")
@@ -0,0 +1,60 @@
+from contextlib import nullcontext
+
+
+class TextView:
+    """
+    View für den Server: rendert den Zustand als einfachen Text in einen
+    Puffer, die Session schickt ihn nach jedem Befehl an den Client.
+
+    Gleiche Schnittstelle wie GameView, Eingaben kommen über die Verbindung.
+    """
+
+    def __init__(self):
+        self.panels = {}
+        self._lines = []
+
+    def take_output(self):
+        """gesammelten Text abholen und Puffer leeren"""
+        text = '\n'.join(self._lines)
+        self._lines = []
+        return text
+
+    def show_welcome(self, readiness=None):
+        self._lines.append('Willkommen beim RagVenture')
+
+    def show_ready(self, label, error=None):
+        pass
+
+    def loading(self, label):
+        return nullcontext()
+
+    def update_panels(self, location, items, exits, inventory):
+        self.panels = {
+            'location': location,
+            'items': items,
+            'exits': exits,
+            'inventory': inventory
+        }
+
+    def refresh(self, status=''):
+        location = self.panels.get('location') or [{'name': '?', 'description': ''}]
+        items = self.panels.get('items') or []
+        exits = self.panels.get('exits') or []
+        inventory = self.panels.get('inventory') or []
+
+        if status:
+            self._lines.append(f"> {status}")
+
+        self._lines.append(f"\n== {location[0]['name']} ==\n{location[0]['description'] or ''}")
+        self._lines.append(
+            'Items: ' + ('; '.join(f"{item['name']}. {item['description']}" for item in items)
+                         or 'Keine Gegenstände zu sehen')
+        )
+        self._lines.append('Exits: ' + (', '.join(exit['name'] for exit in exits) or 'Keine Ausgänge zu sehen'))
+        self._lines.append('Inventar: ' + (', '.join(item['name'] for item in inventory) or 'Nichts dabei'))
+
+    def close(self):
+        pass
+
+    def get_input(self):
+        raise RuntimeError("TextView hat keine Eingabe - Befehle kommen über die Session")